@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+""" AND / OR / NOT amenity searches over places through the
+    BitmapIndex against a walk of every amenity_ids list
+
+    usage: ./benchmarks/amenity_bitmap.py [number of places] """
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from models.engine.bitmap import BitmapIndex  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(name, func, repeat):
+    """ print the mean time of func() over repeat calls """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        found = func()
+    spent = (time.perf_counter() - start) / repeat
+    print('{:32} {:10.2f} ms ({} found)'.format(
+        name, spent * 1e3, found if isinstance(found, int) else len(found)))
+
+
+def main():
+    """ time both on places with random amenities """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rand = random.Random(0)
+    amenities = ['amenity-{}'.format(i) for i in range(40)]
+    places = {}
+    for i in range(count):
+        place = Place.__new__(Place)
+        place.amenity_ids = rand.sample(amenities, rand.randint(0, 12))
+        places['Place.{}'.format(i)] = place
+    start = time.perf_counter()
+    index = BitmapIndex('amenity_ids')
+    for key, place in places.items():
+        index.add(key, place)
+    print('{:32} {:10.2f} s'.format('build', time.perf_counter() - start))
+    wanted, either, unwanted = amenities[:3], amenities[3:5], amenities[5:6]
+
+    def scan():
+        """ every place with the 3 wanted, one of either, no unwanted """
+        return [place for place in places.values()
+                if all(a in place.amenity_ids for a in wanted) and
+                any(a in place.amenity_ids for a in either) and
+                not any(a in place.amenity_ids for a in unwanted)]
+
+    def scan_counts():
+        """ places per amenity """
+        counts = {}
+        for place in places.values():
+            for amenity in place.amenity_ids:
+                counts[amenity] = counts.get(amenity, 0) + 1
+        return counts
+    timed('AND/OR/NOT (scan)', scan, 1)
+    timed('AND/OR/NOT (index)',
+          lambda: index.select(wanted, either, unwanted), 20)
+    timed('AND/OR/NOT count (index)',
+          lambda: index.count(wanted, either, unwanted), 20)
+    timed('counts per amenity (scan)', scan_counts, 1)
+    timed('counts per amenity (index)', index.facets, 20)
+    timed('counts among matches (index)',
+          lambda: index.facets(all_of=wanted), 20)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+""" radius, bounding box and nearest searches over places through the
+    GridIndex against a linear scan
+
+    usage: ./benchmarks/geo_index.py [number of places] """
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from models.engine.geo import GridIndex, distance  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(name, func, repeat):
+    """ print the mean time of func() over repeat calls """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        found = func()
+    spent = (time.perf_counter() - start) / repeat
+    print('{:28} {:10.2f} ms ({} found)'.format(
+        name, spent * 1e3, len(found)))
+
+
+def main():
+    """ time both on random places """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rand = random.Random(0)
+    places = {}
+    for i in range(count):
+        place = Place.__new__(Place)
+        place.latitude = rand.uniform(-60, 70)
+        place.longitude = rand.uniform(-180, 180)
+        places['Place.{}'.format(i)] = place
+    start = time.perf_counter()
+    index = GridIndex()
+    for key, place in places.items():
+        index.add(key, place)
+    print('{:28} {:10.2f} s'.format('build', time.perf_counter() - start))
+    lat, lon, km = 6.5, 3.4, 50
+
+    def scan_radius():
+        """ every place within km """
+        return [place for place in places.values()
+                if distance(lat, lon, place.latitude, place.longitude) <= km]
+
+    def scan_bbox():
+        """ every place in the box """
+        return [place for place in places.values()
+                if 6 <= place.latitude <= 7 and 3 <= place.longitude <= 4]
+
+    def scan_nearest():
+        """ the 10 nearest places """
+        return sorted(places.values(), key=lambda place: distance(
+            lat, lon, place.latitude, place.longitude))[:10]
+    timed('radius 50 km (scan)', scan_radius, 1)
+    timed('radius 50 km (index)',
+          lambda: index.within_radius(lat, lon, km), 100)
+    timed('bbox 1x1 degree (scan)', scan_bbox, 1)
+    timed('bbox 1x1 degree (index)',
+          lambda: index.within_bbox(6, 3, 7, 4), 100)
+    timed('nearest 10 (scan)', scan_nearest, 1)
+    timed('nearest 10 (index)', lambda: index.nearest(lat, lon, 10), 100)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+""" memory held by Place objects and time of a filter, with the
+    numeric fields in each __dict__ against Place.use_columns()
+
+    usage: ./benchmarks/place_columns.py [number of places] """
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import models  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def build(count):
+    """ return count hydrated places, and the bytes they hold """
+    stamp = datetime.now().isoformat()
+    gc.collect()
+    tracemalloc.start()
+    places = [Place.from_dict({
+        'id': '{:012d}'.format(i), '__class__': 'Place',
+        'created_at': stamp, 'updated_at': stamp,
+        'city_id': 'c{}'.format(i % 100), 'name': 'place',
+        'number_rooms': i % 5, 'number_bathrooms': i % 3,
+        'max_guest': i % 9, 'price_by_night': 50 + i % 300,
+        'latitude': (i % 180) - 90.5, 'longitude': (i % 360) - 180.5})
+        for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return places, size
+
+
+def main():
+    """ compare both representations """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for columnar in (False, True):
+        FileStorage._FileStorage__objects = {}
+        models.storage.count()
+        Place.use_columns(columnar)
+        places, size = build(count)
+        for place in places:
+            models.storage.new(place)
+        start = time.perf_counter()
+        if columnar:
+            found = list(Place.filter(max_guest__gte=4,
+                                      price_by_night__lt=150))
+        else:
+            found = [place for place in places if place.max_guest >= 4 and
+                     place.price_by_night < 150]
+        spent = time.perf_counter() - start
+        print('{:8} {:8.1f} MB {:7.3f}s filter ({} found)'.format(
+            'columns' if columnar else 'dict', size / 1e6, spent,
+            len(found)))
+        del places, found
+        Place.use_columns(False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+""" reload throughput (objects/s) of the old eval()/strptime path
+    against BaseModel.from_dict
+
+    usage: ./benchmarks/reload_throughput.py [number of objects] """
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from models.engine.file_storage import classes  # noqa: E402
+from models.base_model import BaseModel  # noqa: E402
+from models.user import User  # noqa: E402
+from models.state import State  # noqa: E402
+from models.city import City  # noqa: E402
+from models.amenity import Amenity  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+
+
+def make_file(path, count):
+    """ write a file.json with count Place/Review/User records """
+    stamp = datetime.now().isoformat()
+    names = ['Place', 'Review', 'User']
+    with open(path, 'w', encoding='utf-8') as fname:
+        json.dump({'{}.{:012d}'.format(names[i % 3], i): {
+            'id': '{:012d}'.format(i), '__class__': names[i % 3],
+            'created_at': stamp, 'updated_at': stamp,
+            'name': 'object {}'.format(i), 'number': i}
+            for i in range(count)}, fname)
+
+
+def old_init(obj, **kwargs):
+    """ BaseModel.__init__(**kwargs) as it was before from_dict """
+    for key, value in kwargs.items():
+        if key == '__class__':
+            continue
+        elif key == 'updated_at':
+            value = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+        elif key == 'created_at':
+            value = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+        if 'id' not in kwargs.keys():
+            obj.id = None
+        if 'created_at' not in kwargs.keys():
+            obj.created_at = datetime.now()
+        if 'updated_at' not in kwargs.keys():
+            obj.updated_at = datetime.now()
+        setattr(obj, key, value)
+
+
+def old_reload(path):
+    """ eval() the class and run the old kwargs constructor """
+    objects = {}
+    with open(path, 'r', encoding='utf-8') as fname:
+        for key, val in json.load(fname).items():
+            cls = eval(val['__class__'])
+            obj = cls.__new__(cls)
+            old_init(obj, **val)
+            objects[key] = obj
+    return objects
+
+
+def new_reload(path):
+    """ registry lookup and BaseModel.from_dict """
+    objects = {}
+    with open(path, 'r', encoding='utf-8') as fname:
+        for key, val in json.load(fname).items():
+            objects[key] = classes[val['__class__']].from_dict(val)
+    return objects
+
+
+def main():
+    """ time both reload paths on the same file """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'file.json')
+        make_file(path, count)
+        for name, reload in (('eval + strptime', old_reload),
+                             ('from_dict', new_reload)):
+            start = time.perf_counter()
+            reload(path)
+            elapsed = time.perf_counter() - start
+            print('{:16} {:9.2f}s {:12,.0f} objects/s'.format(
+                name, elapsed, count / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+""" time to load a JSON snapshot against a binary one, and the lazy
+    FileStorage.reload() of each
+
+    usage: ./benchmarks/snapshot_load.py [number of objects] """
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.engine.layout import JsonLayout, BinaryLayout  # noqa: E402
+
+
+def records(count):
+    """ return count Place records """
+    stamp = datetime.now().isoformat()
+    return {'Place.{:012d}'.format(i): {
+        'id': '{:012d}'.format(i), '__class__': 'Place',
+        'created_at': stamp, 'updated_at': stamp,
+        'name': 'place {}'.format(i), 'description': 'x' * 100}
+        for i in range(count)}
+
+
+def timed(name, func):
+    """ print how long func() takes """
+    start = time.perf_counter()
+    func()
+    print('{:28} {:7.2f}s'.format(name, time.perf_counter() - start))
+
+
+def main():
+    """ write both snapshots and time their loads """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        data = records(count)
+        JsonLayout('file.json').dump(data)
+        BinaryLayout('file.bin').dump(data)
+        del data
+        timed('json load', JsonLayout('file.json').load)
+        timed('binary load', BinaryLayout('file.bin').load)
+        for layout in ('json', 'binary'):
+            FileStorage._FileStorage__objects = {}
+            timed('lazy reload ({})'.format(layout),
+                  FileStorage(layout=layout, lazy=True).reload)
+
+
+if __name__ == '__main__':
+    main()
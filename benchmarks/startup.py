@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+""" start-up time of `python -c "import models"` and of console.py
+    over a large file.json, storage being read on its first access:
+    quit reads nothing, count loads the file, as the import used to
+
+    usage: ./benchmarks/startup.py [number of objects] """
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, root)
+from benchmarks.snapshot_load import records  # noqa: E402
+from models.engine.layout import JsonLayout  # noqa: E402
+
+
+def timed(name, args, stdin=None, repeat=5):
+    """ print the best time of repeat runs of the command args """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, input=stdin, check=True, text=True,
+                       stdout=subprocess.DEVNULL)
+        spent = time.perf_counter() - start
+        best = spent if best is None else min(best, spent)
+    print('{:36} {:8.1f} ms'.format(name, best * 1e3))
+
+
+def main():
+    """ write file.json, then time each start-up in its directory """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    console = os.path.join(root, 'console.py')
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.environ['PYTHONPATH'] = root
+        JsonLayout('file.json').dump(records(count))
+        timed('python -c "import models"',
+              [sys.executable, '-c', 'import models'])
+        timed('import models + reload()',
+              [sys.executable, '-c',
+               'import models; models.storage.reload()'])
+        timed('console.py: quit', [sys.executable, console], 'quit\n')
+        timed('console.py: count Place', [sys.executable, console],
+              'count Place\nquit\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+""" thin client of server.py
+    sends the console commands of stdin, or typed at the (hbnb) prompt,
+    to the server and prints its replies; commands read from a pipe are
+    sent without waiting for the replies of the previous ones
+
+    usage: ./client.py ADDRESS < commands
+    ADDRESS: unix:PATH, HOST:PORT or PORT (on 127.0.0.1) """
+import argparse
+import asyncio
+import sys
+
+
+def parse(address):
+    """ return the keyword arguments of asyncio.open_connection() or
+        start_server() for address, {'path': PATH} for unix:PATH """
+    if address.startswith('unix:'):
+        return {'path': address[5:]}
+    host, _, port = address.rpartition(':')
+    return {'host': host or '127.0.0.1', 'port': int(port)}
+
+
+async def connect(address):
+    """ return the (reader, writer) of a connection to address """
+    kwargs = parse(address)
+    if 'path' in kwargs:
+        return await asyncio.open_unix_connection(**kwargs)
+    return await asyncio.open_connection(**kwargs)
+
+
+def frame(output):
+    """ return the reply of output: its length in bytes on a line, then
+        the bytes """
+    data = output.encode('utf-8')
+    return b'%d\n' % len(data) + data
+
+
+async def receive(reader):
+    """ return the output of the next reply, None once the server has
+        closed the connection """
+    size = await reader.readline()
+    if not size:
+        return None
+    return (await reader.readexactly(int(size))).decode('utf-8')
+
+
+async def send(writer, lines):
+    """ send every command of lines, read in a thread not to hold back
+        the replies while waiting for the next one, then end the
+        connection """
+    loop = asyncio.get_running_loop()
+    lines = iter(lines)
+    while True:
+        line = await loop.run_in_executor(None, next, lines, None)
+        if line is None:
+            break
+        writer.write(line.rstrip('\n').encode('utf-8') + b'\n')
+        await writer.drain()
+    if writer.can_write_eof():
+        writer.write_eof()
+
+
+async def pipe(address, lines, out=None):
+    """ send the commands of lines while printing the replies to out
+        (stdout); return how many replies were printed """
+    out = sys.stdout if out is None else out
+    reader, writer = await connect(address)
+    sender = asyncio.ensure_future(send(writer, lines))
+    count = 0
+    try:
+        while True:
+            output = await receive(reader)
+            if output is None:
+                break
+            out.write(output)
+            count += 1
+    finally:
+        sender.cancel()
+        writer.close()
+    return count
+
+
+async def prompt(address):
+    """ send each command typed at the prompt, printing its reply """
+    reader, writer = await connect(address)
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                line = await loop.run_in_executor(None, input, '(hbnb) ')
+            except EOFError:
+                line = 'EOF'
+            writer.write(line.encode('utf-8') + b'\n')
+            await writer.drain()
+            output = await receive(reader)
+            if output is None:
+                break
+            sys.stdout.write(output)
+            if line.strip() in ('quit', 'EOF'):
+                break
+    finally:
+        writer.close()
+
+
+def main():
+    """ pipe stdin to the server, or prompt on a terminal """
+    parser = argparse.ArgumentParser(description='HBNB client')
+    parser.add_argument('address', help='unix:PATH, HOST:PORT or PORT')
+    options = parser.parse_args()
+    try:
+        if sys.stdin.isatty():
+            asyncio.run(prompt(options.address))
+        else:
+            asyncio.run(pipe(options.address, sys.stdin))
+    except (ConnectionError, FileNotFoundError) as error:
+        sys.exit('** {} **'.format(error))
+    except KeyboardInterrupt:
+        print('')
+
+
+if __name__ == '__main__':
+    main()
@@ -76,7 +76,7 @@ class HBNBCommand(cmd.Cmd):
             return
         key = f"{args[0]}.{args[1]}"
         if key in storage.all():
-            del storage.all()[key]
+            storage.delete(storage.all()[key])
             storage.save()
         else:
             print('** no instance found **')
@@ -86,7 +86,7 @@ class HBNBCommand(cmd.Cmd):
         if not arg:
             print([str(obj) for obj in storage.all().values()])
         elif arg in self.classes:
-            print([str(obj) for key, obj in storage.all().items() if key.startswith(arg)])
+            print([str(obj) for obj in storage.all(arg).values()])
         else:
             print("** class doesn't exist **")
 
@@ -134,7 +134,7 @@ class HBNBCommand(cmd.Cmd):
 
     def do_count(self, class_name):
         """ Count instances of a class """
-        count = sum(1 for key in storage.all() if key.startswith(class_name + '.'))
+        count = storage.count(class_name)
         print(count)
 
 
@@ -85,7 +85,7 @@ class HBNBCommand(cmd.Cmd):
             return
         key = f"{args[0]}.{args[1]}"
         if key in storage.all():
-            del storage.all()[key]
+            storage.delete(storage.all()[key])
             storage.save()
         else:
             print("** no instance found **")
@@ -95,14 +95,14 @@ class HBNBCommand(cmd.Cmd):
         if len(arg) == 0:
             print([str(obj) for obj in storage.all().values()])
         elif arg in self.classes:
-            print([str(obj) for key, obj in storage.all().items() if key.startswith(arg)])
+            print([str(obj) for obj in storage.all(arg).values()])
         else:
             print("** class doesn't exist **")
 
     def do_count(self, arg):
         """Retrieve the number of instances of a class"""
         if arg in self.classes:
-            count = len([key for key in storage.all() if key.startswith(arg)])
+            count = storage.count(arg)
             print(count)
         else:
             print("** class doesn't exist **")
@@ -1,7 +1,15 @@
 #!/usr/bin/python3
 """ Holberton AirBnB Console """
+import argparse
+import ast
 import cmd
 import json
+import re
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from itertools import chain
 from models import storage
 from models.base_model import BaseModel
 from models.user import User
@@ -10,6 +18,8 @@ from models.state import State
 from models.city import City
 from models.amenity import Amenity
 from models.review import Review
+from models.engine.frame import stats
+from models.engine.view import View
 
 
 class HBNBCommand(cmd.Cmd):
@@ -21,12 +31,57 @@ class HBNBCommand(cmd.Cmd):
 
     def do_quit(self, arg):
         """ Exit method for quit typing """
-        exit()
+        storage.flush()
+        return True
 
     def do_EOF(self, arg):
         """ Exit method for EOF """
         print('')
-        exit()
+        storage.flush()
+        return True
+
+    def run(self, line):
+        """ run the command line; return (what it printed, whether it
+            asked to stop), an exception being printed as ** ... ** """
+        out = StringIO()
+        try:
+            with redirect_stdout(out):
+                stop = self.onecmd(line)
+        except Exception as error:
+            stop = False
+            out.write('** {}: {} **\n'.format(type(error).__name__, error))
+        return out.getvalue(), bool(stop)
+
+    def run_batch(self, lines, every=0, errors=None):
+        """ run the commands of lines, one per line, inside a single
+            storage batch, committed at the end and every `every`
+            commands if given; a command printing ** ... ** or raising
+            is reported with its line number on errors (stderr) and the
+            next one runs; return (number of commands, number of errors) """
+        errors = sys.stderr if errors is None else errors
+        start = time.perf_counter()
+        count = failed = 0
+        with storage.batch():
+            for number, line in enumerate(lines, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                count += 1
+                output, stop = self.run(line)
+                print(output, end='')
+                if output.startswith('** '):
+                    failed += 1
+                    print('line {}: {}: {}'.format(
+                        number, line, output.strip()), file=errors)
+                if stop:
+                    break
+                if every and not count % every:
+                    storage.flush()
+        spent = time.perf_counter() - start
+        print('{} commands, {} errors in {:.2f}s ({:.0f} commands/s)'.format(
+            count, failed, spent, count / spent if spent else 0),
+            file=errors)
+        return count, failed
 
     def emptyline(self):
         """ Method to pass when emptyline entered """
@@ -44,6 +99,68 @@ class HBNBCommand(cmd.Cmd):
         else:
             print("** class doesn't exist **")
 
+    def do_import(self, arg):
+        """ Create instances of a class from a JSON Lines file, one
+            object per line, keeping the ids it gives, saved once:
+            import <class> <file.jsonl> """
+        args = arg.split(None, 1)
+        if not args:
+            print('** class name missing **')
+            return
+        if args[0] not in self.classes:
+            print("** class doesn't exist **")
+            return
+        if len(args) == 1:
+            print('** file name missing **')
+            return
+        cls = self.classes[args[0]]
+        skipped = []
+
+        def objects(lines):
+            """ yield the instance of each valid line """
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if (not isinstance(record, dict) or
+                            record.get('__class__', args[0]) != args[0]):
+                        raise ValueError
+                    yield cls.from_dict(record)
+                except (ValueError, TypeError):
+                    skipped.append(number)
+        try:
+            with open(args[1], encoding='utf-8') as lines:
+                count = storage.bulk_insert(objects(lines))
+        except OSError:
+            print("** file doesn't exist **")
+            return
+        for number in skipped:
+            print('** invalid line {} **'.format(number))
+        print(count)
+
+    def do_export(self, arg):
+        """ Write the instances of a class to a file, one at a time:
+            export <class> <jsonl|csv> <file> """
+        args = arg.split(None, 2)
+        if not args:
+            print('** class name missing **')
+            return
+        if args[0] not in self.classes:
+            print("** class doesn't exist **")
+            return
+        if len(args) < 2 or args[1] not in ('jsonl', 'csv'):
+            print('** format missing **' if len(args) < 2
+                  else "** format doesn't exist **")
+            return
+        if len(args) < 3:
+            print('** file name missing **')
+            return
+        try:
+            print(storage.export(args[0], args[1], args[2]))
+        except OSError:
+            print("** file can't be written **")
+
     def do_show(self, arg):
         """ Method to print instance """
         args = arg.split()
@@ -56,8 +173,7 @@ class HBNBCommand(cmd.Cmd):
         if len(args) == 1:
             print('** instance id missing **')
             return
-        key = f"{args[0]}.{args[1]}"
-        obj = storage.all().get(key)
+        obj = storage.get(args[0], args[1])
         if obj:
             print(obj)
         else:
@@ -75,13 +191,202 @@ class HBNBCommand(cmd.Cmd):
         if len(args) == 1:
             print('** instance id missing **')
             return
-        key = f"{args[0]}.{args[1]}"
-        if key in storage.all():
-            del storage.all()[key]
+        obj = storage.get(args[0], args[1])
+        if obj:
+            storage.delete(obj)
             storage.save()
         else:
             print('** no instance found **')
 
+    @staticmethod
+    def options(arg, allowed):
+        """ return {name: value} of the name=value of arg, None if one
+            of them is not in allowed """
+        pattern = r'(\w+)=("[^"]*"|\'[^\']*\'|[^,\s]+)'
+        options = {name: value.strip("\"'")
+                   for name, value in re.findall(pattern, arg)}
+        if (re.sub(pattern, '', arg).strip(' ,') or
+                not set(options) <= set(allowed)):
+            return None
+        return options
+
+    def do_all(self, arg):
+        """ Print all instances, of a class if given, as they are read:
+            all [<class>] [limit=<n>] [offset=<n>] [after=<id>]
+            [format=jsonl]
+            after=<id> starts after that instance, for the next page,
+            format=jsonl prints one JSON object per line """
+        args = arg.split(None, 1)
+        cls = None
+        if args and args[0] in self.classes:
+            cls = args.pop(0)
+        elif args and '=' not in args[0]:
+            print("** class doesn't exist **")
+            return
+        options = self.options(' '.join(args),
+                               ('limit', 'offset', 'after', 'format'))
+        try:
+            limit = options.get('limit')
+            limit = None if limit is None else int(limit)
+            offset = int(options.get('offset', 0))
+            if (limit or 0) < 0 or offset < 0 or options.get(
+                    'format', 'list') not in ('list', 'jsonl'):
+                raise ValueError
+        except (AttributeError, ValueError):
+            print('** invalid options **')
+            return
+        objs = storage.page(cls, limit, offset, options.get('after'))
+        try:
+            objs = chain([next(objs)], objs)
+        except StopIteration:
+            objs = iter(())
+        except ValueError:
+            print('** no instance found **')
+            return
+        if options.get('format') == 'jsonl':
+            for obj in objs:
+                print(obj.to_json())
+            return
+        sep = '['
+        for obj in objs:
+            print(sep + repr(str(obj)), end='')
+            sep = ', '
+        print('[]' if sep == '[' else ']')
+
+    def do_count(self, arg):
+        """ Count instances of a class, per value of an attribute with
+            count <class> by <attribute>, through a view kept up to
+            date from then on for a foreign key, counted once for any
+            other attribute """
+        args = arg.split()
+        if not args or args[0] not in self.classes:
+            print("** class doesn't exist **")
+        elif len(args) == 1:
+            print(storage.count(args[0]))
+        elif len(args) == 3 and args[1] == 'by':
+            if args[2] in getattr(self.classes[args[0]], 'foreign_keys',
+                                  ()):
+                name = '{}.count.{}'.format(args[0], args[2])
+                try:
+                    view = storage.view(name)
+                except KeyError:
+                    view = storage.materialize(name, args[0], args[2])
+            else:
+                view = View(args[0], args[2])
+                for key, obj in storage.all(args[0]).items():
+                    view.add(key, obj)
+            print(view.results())
+        else:
+            print('** invalid count **')
+
+    def do_where(self, arg):
+        """ Print the instances of a class matching conditions:
+            where <class> <attribute>[__<op>]=<value>, ...
+            [, order="[-]<attribute>"] [, limit=<n>]
+            op one of eq, ne, lt, lte, gt, gte """
+        args = arg.split(' ', 1)
+        if not args[0]:
+            print('** class name missing **')
+            return
+        if args[0] not in self.classes:
+            print("** class doesn't exist **")
+            return
+        try:
+            call = ast.parse('f({})'.format(args[1] if len(args) > 1
+                                            else ''), mode='eval').body
+            if call.args or any(kw.arg is None for kw in call.keywords):
+                raise ValueError
+            conditions = {kw.arg: ast.literal_eval(kw.value)
+                          for kw in call.keywords}
+            count = conditions.pop('limit', None)
+            order = conditions.pop('order', None)
+            query = storage.query(args[0]).where(**conditions).limit(count)
+            if order is not None:
+                query = query.order_by(order)
+            objs = list(query)
+        except (SyntaxError, ValueError, TypeError):
+            print('** invalid query **')
+            return
+        print([str(obj) for obj in objs])
+
+    def do_geo(self, arg):
+        """ Print the places found by the spatial index:
+            geo radius <latitude> <longitude> <km>
+            geo bbox <south> <west> <north> <east>
+            geo nearest <latitude> <longitude> <count> """
+        args = arg.split()
+        searches = {'radius': 3, 'bbox': 4, 'nearest': 3}
+        if not args or args[0] not in searches:
+            print('** search missing **' if not args
+                  else "** search doesn't exist **")
+            return
+        if len(args) != searches[args[0]] + 1:
+            print('** invalid coordinates **')
+            return
+        try:
+            values = [float(value) for value in args[1:]]
+            if args[0] == 'nearest':
+                values[2] = int(args[3])
+                if values[2] < 0:
+                    raise ValueError(args[3])
+        except ValueError:
+            print('** invalid coordinates **')
+            return
+        index = storage.geo()
+        if args[0] == 'radius':
+            places = index.within_radius(*values)
+        elif args[0] == 'bbox':
+            places = index.within_bbox(*values)
+        else:
+            places = index.nearest(*values)
+        print([str(obj) for obj in places])
+
+    def do_search(self, arg):
+        """ Print the instances best matching words, best first:
+            search [<class>] <words> """
+        args = arg.split()
+        cls = None
+        if args and args[0] in self.classes:
+            cls = args.pop(0)
+        if not args:
+            print('** words missing **')
+            return
+        print([str(obj) for obj in storage.search(' '.join(args), cls)])
+
+    def do_stats(self, arg):
+        """ Print an aggregate of the instances of a class per group:
+            stats <class> count by <attribute>
+            stats <class> <sum|mean|min|max|count> <attribute> by <attribute>
+            the group attribute can follow foreign keys, e.g.
+            stats Place sum max_guest by city_id.state_id """
+        args = arg.split()
+        if not args:
+            print('** class name missing **')
+            return
+        if args[0] not in self.classes:
+            print("** class doesn't exist **")
+            return
+        if len(args) not in (4, 5) or args[-2] != 'by':
+            print('** invalid stats **')
+            return
+        attr = args[2] if len(args) == 5 else None
+        try:
+            print(stats(storage, args[0], args[-1], args[1], attr))
+        except ImportError:
+            print('** NumPy is not installed **')
+        except (KeyError, ValueError):
+            print('** invalid stats **')
+
+    @staticmethod
+    def assign(obj, name, value):
+        """ set the attribute, False if its column cannot hold value """
+        try:
+            setattr(obj, name, value)
+        except (TypeError, ValueError, OverflowError):
+            print('** invalid value **')
+            return False
+        return True
+
     def do_update(self, arg):
         """ Update an instance with attributes """
         args = arg.split(' ', 2)
@@ -94,20 +399,20 @@ class HBNBCommand(cmd.Cmd):
         if len(args) < 2:
             print('** instance id missing **')
             return
-        key = f"{args[0]}.{args[1]}"
-        if key not in storage.all():
+        obj = storage.get(args[0], args[1])
+        if not obj:
             print('** no instance found **')
             return
         if len(args) == 2:
             print('** attribute name missing **')
             return
 
-        obj = storage.all()[key]
         try:
             data = json.loads(args[2].replace("'", "\""))
             if isinstance(data, dict):
                 for attr_name, attr_value in data.items():
-                    setattr(obj, attr_name, attr_value)
+                    if not self.assign(obj, attr_name, attr_value):
+                        return
                 obj.save()
             else:
                 print("** invalid dictionary **")
@@ -117,11 +422,11 @@ class HBNBCommand(cmd.Cmd):
                 attr_name = parts[0]
                 attr_value = parts[1].strip("\"'")
                 try:
-                    attr_value = eval(attr_value)
-                except (SyntaxError, NameError):
+                    attr_value = ast.literal_eval(attr_value)
+                except (SyntaxError, ValueError):
                     pass
-                setattr(obj, attr_name, attr_value)
-                obj.save()
+                if self.assign(obj, attr_name, attr_value):
+                    obj.save()
             else:
                 print('** invalid update format **')
 
@@ -130,7 +435,15 @@ class HBNBCommand(cmd.Cmd):
         if '.' in line:
             class_name, method_call = line.split('.', 1)
             if class_name in self.classes:
-                if method_call.startswith("update(") and method_call.endswith(")"):
+                if (method_call.startswith("all(") and
+                        method_call.endswith(")")):
+                    self.do_all(class_name + " " + method_call[4:-1])
+                elif method_call == "count()":
+                    self.do_count(class_name)
+                elif (method_call.startswith("where(") and
+                      method_call.endswith(")")):
+                    self.do_where(class_name + " " + method_call[6:-1])
+                elif method_call.startswith("update(") and method_call.endswith(")"):
                     params = method_call[7:-1].split(", ", 1)
                     instance_id = params[0].strip("\"'")
                     if len(params) > 1 and params[1].startswith("{"):
@@ -150,4 +463,19 @@ class HBNBCommand(cmd.Cmd):
 
 
 if __name__ == '__main__':
-    HBNBCommand().cmdloop()
+    parser = argparse.ArgumentParser(description='HBNB console')
+    parser.add_argument('--batch', metavar='SCRIPT',
+                        help='run the commands of SCRIPT (- for stdin) '
+                             'and save once at the end')
+    parser.add_argument('--every', type=int, default=0, metavar='N',
+                        help='with --batch, also save every N commands')
+    options = parser.parse_args()
+    if options.batch is None:
+        HBNBCommand().cmdloop()
+    elif options.batch == '-':
+        sys.exit(1 if HBNBCommand().run_batch(sys.stdin,
+                                              options.every)[1] else 0)
+    else:
+        with open(options.batch, encoding='utf-8') as script:
+            sys.exit(1 if HBNBCommand().run_batch(script,
+                                                  options.every)[1] else 0)
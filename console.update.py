@@ -76,7 +76,7 @@ class HBNBCommand(cmd.Cmd):
             return
         key = f"{args[0]}.{args[1]}"
         if key in storage.all():
-            del storage.all()[key]
+            storage.delete(storage.all()[key])
             storage.save()
         else:
             print('** no instance found **')
@@ -147,7 +147,7 @@ class HBNBCommand(cmd.Cmd):
 
     def do_count(self, class_name):
         """ Count instances of a class """
-        count = sum(1 for key in storage.all() if key.startswith(class_name + '.'))
+        count = storage.count(class_name)
         print(count)
 
 
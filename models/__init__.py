@@ -1,5 +1,19 @@
 #!/usr/bin/python3
-""" init for class FileStorage """
-from models.engine.file_storage import FileStorage
-storage = FileStorage()
-storage.reload()
+""" init for the storage engine, picked by HBNB_TYPE_STORAGE
+    nothing is read at import: storage loads its file, or connects to
+    its database, on its first access """
+from os import getenv
+storage_t = getenv('HBNB_TYPE_STORAGE')
+if storage_t == 'db':
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage(getenv('HBNB_DB_PATH', 'hbnb.db'))
+else:
+    from models.engine.file_storage import FileStorage
+    storage = FileStorage(
+        journal=getenv('HBNB_STORAGE_JOURNAL') == '1',
+        lazy=getenv('HBNB_STORAGE_LAZY') == '1',
+        save_window=float(getenv('HBNB_SAVE_WINDOW', 0)),
+        layout=getenv('HBNB_STORAGE_LAYOUT', 'json'))
+if getenv('HBNB_PLACE_COLUMNS') == '1':
+    from models.place import Place
+    Place.use_columns()
@@ -2,28 +2,30 @@
 """ Class BaseModel """
 from datetime import datetime
 from uuid import uuid4
+import json
 import models
 
 
 class BaseModel:
     """ construct """
+    __slots__ = ('__dict__', '__weakref__', '__cache')
+    cache_hits = 0
+    cache_misses = 0
 
     def __init__(self, *args, **kwargs):
         """ Construct """
         if kwargs:
+            if 'id' not in kwargs:
+                self.id = str(uuid4())
+            if 'created_at' not in kwargs:
+                self.created_at = datetime.now()
+            if 'updated_at' not in kwargs:
+                self.updated_at = datetime.now()
             for key, value in kwargs.items():
                 if key == '__class__':
                     continue
-                elif key == 'updated_at':
-                    value = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
-                elif key == 'created_at':
-                    value = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
-                if 'id' not in kwargs.keys():
-                    self.id = str(uuid4())
-                if 'created_at' not in kwargs.keys():
-                    self.created_at = datetime.now()
-                if 'updated_at' not in kwargs.keys():
-                    self.updated_at = datetime.now()
+                elif key == 'updated_at' or key == 'created_at':
+                    value = datetime.fromisoformat(value)
                 setattr(self, key, value)
         else:
             self.id = str(uuid4())
@@ -31,20 +33,88 @@ class BaseModel:
             self.updated_at = self.created_at
             models.storage.new(self)
 
+    @classmethod
+    def from_dict(cls, record):
+        """ build an instance from a to_dict() record in one go """
+        if not {'id', 'created_at', 'updated_at'} <= record.keys():
+            return cls(**record)
+        obj = cls.__new__(cls)
+        attrs = obj.__dict__
+        attrs.update(record)
+        attrs.pop('__class__', None)
+        attrs['created_at'] = datetime.fromisoformat(record['created_at'])
+        attrs['updated_at'] = datetime.fromisoformat(record['updated_at'])
+        return obj
+
+    def __setattr__(self, name, value):
+        """ set the attribute, drop the cached forms and tell storage
+            the instance changed """
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_BaseModel__cache', None)
+        models.storage.touch(self)
+
+    def __delattr__(self, name):
+        """ delete the attribute, drop the cached forms and tell
+            storage the instance changed """
+        object.__delattr__(self, name)
+        object.__setattr__(self, '_BaseModel__cache', None)
+        models.storage.touch(self)
+
+    def cached(self, form, render):
+        """ return the form (str, dict, json) of the instance cached
+            since its last change, render() on a miss
+            an instance holding a list, dict or set can change without
+            a setattr, so its forms are rendered every time """
+        if any(isinstance(value, (list, dict, set))
+               for value in self.__dict__.values()):
+            BaseModel.cache_misses += 1
+            return render()
+        cache = getattr(self, '_BaseModel__cache', None)
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, '_BaseModel__cache', cache)
+        value = cache.get(form)
+        if value is None:
+            BaseModel.cache_misses += 1
+            value = cache[form] = render()
+        else:
+            BaseModel.cache_hits += 1
+        return value
+
+    @classmethod
+    def cache_info(cls):
+        """ return the hits, misses and hit rate of cached() so far """
+        calls = BaseModel.cache_hits + BaseModel.cache_misses
+        return {'hits': BaseModel.cache_hits,
+                'misses': BaseModel.cache_misses,
+                'rate': BaseModel.cache_hits / calls if calls else 0.0}
+
     def __str__(self):
-        """ String """
-        return('[' + type(self).__name__ + '] (' + str(self.id) +
-               ') ' + str(self.__dict__))
+        """ String, cached until an attribute changes, unless one
+            holds a list or dict """
+        return self.cached('str', lambda: '[' + type(self).__name__ +
+                           '] (' + str(self.id) + ') ' + str(self.__dict__))
 
     def save(self):
         """ save function """
         self.updated_at = datetime.now()
+        models.storage.new(self)
         models.storage.save()
 
     def to_dict(self):
-        """ Return a dictonary """
+        """ Return a dictonary, a copy of the one cached until an
+            attribute changes, unless one holds a list or dict """
+        return dict(self.cached('dict', self.__to_dict))
+
+    def __to_dict(self):
+        """ Return a new dictonary """
         aux_dict = self.__dict__.copy()
         aux_dict['__class__'] = self.__class__.__name__
         aux_dict['created_at'] = self.created_at.isoformat()
         aux_dict['updated_at'] = self.updated_at.isoformat()
         return aux_dict
+
+    def to_json(self):
+        """ Return to_dict() encoded as JSON, cached until an
+            attribute changes, unless one holds a list or dict """
+        return self.cached('json', lambda: json.dumps(self.to_dict()))
@@ -5,5 +5,6 @@ from models.base_model import BaseModel
 
 class City(BaseModel):
     """ City class that inherits BaseModel """
+    foreign_keys = ('state_id',)
     state_id = ""
     name = ""
@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+""" class BitmapIndex
+    one bitset per value of a list attribute, e.g. the amenity_ids of
+    places, over row numbers given to the indexed objects, so that
+    AND, OR and NOT of values are bitwise operations on whole words
+    rows are read out of the bitsets through NumPy when it is installed """
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+bits_of = [tuple(bit for bit in range(8) if byte >> bit & 1)
+           for byte in range(256)]
+
+
+def popcount(mask):
+    """ return the number of bits set in the int mask """
+    return bin(mask).count('1')
+
+
+popcount = getattr(int, 'bit_count', popcount)
+
+
+def set_bits(mask):
+    """ return the numbers of the bits set in the int mask, in order """
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+    if numpy is not None:
+        return numpy.flatnonzero(numpy.unpackbits(
+            numpy.frombuffer(data, numpy.uint8), bitorder='little')).tolist()
+    return [pos << 3 | bit for pos, byte in enumerate(data) if byte
+            for bit in bits_of[byte]]
+
+
+class BitmapIndex:
+    """ bitsets {value: bytearray} over the rows of the keys, with the
+        values filed for each key so a changed object can be refiled """
+
+    def __init__(self, attr):
+        """ empty index over the list attribute attr """
+        self.attr = attr
+        self.bitsets = {}
+        self.counts = {}
+        self.live = bytearray()
+        self.rows = {}
+        self.keys = []
+        self.objs = []
+        self.free = []
+        self.filed = {}
+
+    def __len__(self):
+        """ return the number of objects indexed """
+        return len(self.rows)
+
+    def values(self, obj):
+        """ return the distinct values in attr of obj """
+        values = getattr(obj, self.attr, None)
+        if not isinstance(values, (list, tuple, set)):
+            return ()
+        return tuple(dict.fromkeys(values))
+
+    @staticmethod
+    def __set(bitset, row, on=True):
+        """ turn the bit row of bitset on or off """
+        pos = row >> 3
+        if pos >= len(bitset):
+            bitset.extend(bytes(pos + 1 - len(bitset)))
+        if on:
+            bitset[pos] |= 1 << (row & 7)
+        else:
+            bitset[pos] &= ~(1 << (row & 7))
+
+    def add(self, key, obj):
+        """ file obj under its values, refiling it if it was filed """
+        values = self.values(obj)
+        row = self.rows.get(key)
+        old = self.filed.get(key, ())
+        if row is None:
+            row = self.free.pop() if self.free else len(self.keys)
+            if row == len(self.keys):
+                self.keys.append(key)
+                self.objs.append(obj)
+            self.rows[key] = row
+            self.__set(self.live, row)
+        else:
+            self.__unfile(key, row, values)
+        self.keys[row] = key
+        self.objs[row] = obj
+        for value in values:
+            if value not in old:
+                self.__set(self.bitsets.setdefault(value, bytearray()), row)
+                self.counts[value] = self.counts.get(value, 0) + 1
+        self.filed[key] = values
+
+    def __unfile(self, key, row, keep=()):
+        """ clear the bits of row for the values of key not in keep """
+        for value in self.filed.pop(key, ()):
+            if value in keep:
+                continue
+            self.__set(self.bitsets[value], row, False)
+            self.counts[value] -= 1
+            if not self.counts[value]:
+                del self.counts[value], self.bitsets[value]
+
+    def remove(self, key):
+        """ drop key from the index, its row is given to the next key """
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        self.__unfile(key, row)
+        self.__set(self.live, row, False)
+        self.keys[row] = self.objs[row] = None
+        self.free.append(row)
+
+    def bits(self, value):
+        """ return the bitset of value as an int """
+        return int.from_bytes(self.bitsets.get(value, b''), 'little')
+
+    def mask(self, all_of=(), any_of=(), none_of=()):
+        """ return the rows, as an int, of the objects with every value
+            of all_of, at least one of any_of if given and none of
+            none_of """
+        mask = int.from_bytes(self.live, 'little')
+        for value in all_of:
+            mask &= self.bits(value)
+        if any_of:
+            either = 0
+            for value in any_of:
+                either |= self.bits(value)
+            mask &= either
+        for value in none_of:
+            mask &= ~self.bits(value)
+        return mask
+
+    def select(self, all_of=(), any_of=(), none_of=()):
+        """ return the objects of mask(all_of, any_of, none_of) """
+        return list(map(self.objs.__getitem__,
+                        set_bits(self.mask(all_of, any_of, none_of))))
+
+    def count(self, all_of=(), any_of=(), none_of=()):
+        """ return the number of objects of mask(all_of, any_of,
+            none_of) """
+        return popcount(self.mask(all_of, any_of, none_of))
+
+    def facets(self, all_of=(), any_of=(), none_of=()):
+        """ return {value: number of objects with value} among the
+            objects of mask(all_of, any_of, none_of), every object if
+            none is given """
+        if not (all_of or any_of or none_of):
+            return dict(self.counts)
+        mask = self.mask(all_of, any_of, none_of)
+        facets = {}
+        for value in self.bitsets:
+            count = popcount(self.bits(value) & mask)
+            if count:
+                facets[value] = count
+        return facets
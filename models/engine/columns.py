@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+""" class ColumnStore
+    keeps numeric attributes in typed arrays, one per attribute,
+    instead of the __dict__ of each object
+    filters run on NumPy views of the arrays when it is installed """
+import operator
+from array import array
+from itertools import compress, repeat
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+operators = {'eq': operator.eq, 'ne': operator.ne,
+             'lt': operator.lt, 'lte': operator.le,
+             'gt': operator.gt, 'gte': operator.ge}
+
+
+class Column:
+    """ attribute kept in the column name of a ColumnStore """
+
+    def __init__(self, store, name):
+        """ attribute name of the objects of store """
+        self.store = store
+        self.name = name
+        self.default = 0.0 if store.columns[name].typecode == 'd' else 0
+
+    def __get__(self, obj, owner=None):
+        """ the value in the row of obj, the default for the class """
+        if obj is None:
+            return self.default
+        row = getattr(obj, self.store.row, None)
+        if row is None:
+            return self.default
+        return self.store.columns[self.name][row]
+
+    def __set__(self, obj, value):
+        """ write value in the row of obj, TypeError if the column
+            cannot hold it """
+        self.store.set(obj, self.name, value)
+
+    def __delete__(self, obj):
+        """ put the default value back """
+        self.store.set(obj, self.name, self.default)
+
+
+class ColumnStore:
+    """ typed columns holding one row per object, each row owned by
+        the id of its object """
+
+    def __init__(self, fields, row):
+        """ fields: {attribute name: array typecode}
+            row: name of the slot where an object keeps its row """
+        self.columns = {name: array(code) for name, code in fields.items()}
+        self.row = row
+        self.owners = []
+        self.free = []
+
+    def __len__(self):
+        """ return the number of rows in use """
+        return len(self.owners) - len(self.free)
+
+    def allocate(self, obj):
+        """ return a row of default values for obj """
+        if self.free:
+            row = self.free.pop()
+            for column in self.columns.values():
+                column[row] = 0
+        else:
+            row = len(self.owners)
+            for column in self.columns.values():
+                column.append(0)
+            self.owners.append(None)
+        self.owners[row] = obj.__dict__.get('id')
+        object.__setattr__(obj, self.row, row)
+        return row
+
+    def claim(self, obj):
+        """ record the id of obj as the owner of its row """
+        row = getattr(obj, self.row, None)
+        if row is not None:
+            self.owners[row] = obj.__dict__.get('id')
+
+    def release(self, obj):
+        """ free the row of obj, unless it is not one of this store """
+        row = getattr(obj, self.row, None)
+        if (row is not None and row < len(self.owners) and
+                self.owners[row] is obj.__dict__.get('id')):
+            self.owners[row] = None
+            self.free.append(row)
+
+    def set(self, obj, name, value):
+        """ write value in the column name of obj """
+        row = getattr(obj, self.row, None)
+        if row is None:
+            row = self.allocate(obj)
+        self.columns[name][row] = value
+
+    def values(self, obj):
+        """ return {field: value} of obj, empty if it has no row """
+        row = getattr(obj, self.row, None)
+        if row is None:
+            return {}
+        return {name: column[row] for name, column in self.columns.items()}
+
+    def rows(self, **conditions):
+        """ return the rows in use matching every <field>__<op>=value,
+            op one of eq (the default), ne, lt, lte, gt, gte
+            each condition is run over a whole column at once """
+        tests = []
+        for condition, value in conditions.items():
+            name, _, op = condition.partition('__')
+            if name not in self.columns or (op or 'eq') not in operators:
+                raise ValueError('unknown condition ' + condition)
+            tests.append((self.columns[name], operators[op or 'eq'], value))
+        if numpy is not None and tests:
+            mask = None
+            for column, test, value in tests:
+                hits = test(numpy.frombuffer(column, column.typecode), value)
+                mask = hits if mask is None else mask & hits
+            selected = numpy.flatnonzero(mask).tolist()
+        else:
+            selected = None
+            for column, test, value in tests:
+                if selected is None:
+                    selected, values = range(len(column)), column
+                else:
+                    values = map(column.__getitem__, selected)
+                selected = list(compress(selected, map(test, values,
+                                                       repeat(value))))
+        if selected is None:
+            selected = range(len(self.owners))
+        return list(compress(selected, map(self.owners.__getitem__,
+                                           selected)))
+
+    def ids(self, **conditions):
+        """ return the ids owning the rows() matching the conditions """
+        return list(map(self.owners.__getitem__, self.rows(**conditions)))
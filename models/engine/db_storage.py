@@ -0,0 +1,445 @@
+#!/usr/bin/python3
+""" class DBStorage
+    stores instances in a SQLite database, one table per class """
+import atexit
+import json
+import sqlite3
+from contextlib import contextmanager
+from itertools import islice
+from models.engine.file_storage import classes
+from models.engine import export
+from models.engine.bitmap import BitmapIndex
+from models.engine.frame import Frame
+from models.engine.geo import GridIndex
+from models.engine.layout import stat
+from models.engine.query import Query
+from models.engine.sorted_index import SortedIndex
+from models.engine.text_index import TextIndex
+from models.engine.view import View
+
+
+def bindable(value):
+    """ return value as SQLite binds it in a foreign key column, JSON
+        text unless it is a string, a number or None """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, default=str)
+
+
+class DBStorage:
+    """ construct """
+
+    def __init__(self, path='hbnb.db'):
+        """ storage in the SQLite database file at path """
+        self.__path = path
+        self.__connection = None
+        self.__objects = {}
+        self.__changed = {}
+        self.__ranges = {}
+        self.__bitmaps = {}
+        self.__geo = None
+        self.__text = None
+        self.__views = {}
+        self.__pending = False
+        self.__depth = 0
+        atexit.register(self.close)
+
+    @property
+    def __conn(self):
+        """ the connection, opened by reload() on the first access """
+        if self.__connection is None:
+            self.reload()
+        return self.__connection
+
+    @staticmethod
+    def __class_name(cls):
+        """ return the class name of cls, a class or its name """
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def __build(self, name, id, data):
+        """ return the object of the row, the same one every time """
+        key = name + "." + id
+        obj = self.__objects.get(key)
+        if obj is None:
+            obj = classes[name].from_dict(json.loads(data))
+            self.__objects[key] = obj
+        return obj
+
+    def __names(self, cls):
+        """ return the table names of cls, or all of them """
+        if cls is None:
+            return list(classes)
+        name = self.__class_name(cls)
+        return [name] if name in classes else []
+
+    @staticmethod
+    def __foreign_keys(name):
+        """ return the foreign key columns of the class name """
+        return getattr(classes[name], 'foreign_keys', ())
+
+    def all(self, cls=None):
+        """ return dictionary objects, only those of cls if given """
+        names = self.__names(cls)
+        objs = {}
+        for name in names:
+            for id, data in self.__conn.execute(
+                    'SELECT id, data FROM "{}"'.format(name)):
+                objs[name + "." + id] = self.__build(name, id, data)
+        return objs
+
+    def count(self, cls=None):
+        """ return the number of objects, only those of cls if given """
+        names = self.__names(cls)
+        return sum(self.__conn.execute(
+            'SELECT COUNT(*) FROM "{}"'.format(name)).fetchone()[0]
+            for name in names)
+
+    def get(self, cls, id):
+        """ return the object of cls with this id, or None """
+        name = self.__class_name(cls)
+        if name not in classes:
+            return None
+        obj = self.__objects.get(name + "." + str(id))
+        if obj is not None:
+            return obj
+        row = self.__conn.execute(
+            'SELECT data FROM "{}" WHERE id = ?'.format(name),
+            (str(id),)).fetchone()
+        return self.__build(name, str(id), row[0]) if row else None
+
+    def page(self, cls=None, limit=None, offset=0, after=None):
+        """ yield the objects, only those of cls if given, in the order
+            they were first written table by table, starting after the
+            one whose id is after if given, skipping offset more and
+            stopping after limit, rows being read from the database as
+            they are needed
+            ValueError if there is no object with the id after """
+        names = self.__names(cls)
+        if after is not None:
+            for i, name in enumerate(names):
+                if self.__conn.execute(
+                        'SELECT 1 FROM "{}" WHERE id = ?'.format(name),
+                        (after,)).fetchone():
+                    names = names[i:]
+                    break
+            else:
+                raise ValueError('no instance with id {}'.format(after))
+        yield from islice(self.__rows(names, after), offset,
+                          None if limit is None else offset + limit)
+
+    def __rows(self, names, after=None):
+        """ yield the objects of the tables names in rowid order, those
+            of the first table after the row of the id after only """
+        for name in names:
+            query = 'SELECT id, data FROM "{}"'.format(name)
+            if after is not None:
+                rows = self.__conn.execute(
+                    query + ' WHERE rowid > (SELECT rowid FROM "{}" '
+                    'WHERE id = ?) ORDER BY rowid'.format(name), (after,))
+                after = None
+            else:
+                rows = self.__conn.execute(query + ' ORDER BY rowid')
+            for id, data in rows:
+                yield self.__build(name, id, data)
+
+    def export(self, cls, fmt, path):
+        """ write the objects of cls to path as JSON Lines (fmt jsonl)
+            or CSV (fmt csv) one row at a time, from the JSON of the
+            rows; return how many were written """
+        name = self.__class_name(cls)
+        rows = self.__conn.execute(
+            'SELECT data FROM "{}" ORDER BY rowid'.format(name))
+        return export.export((data for data, in rows), classes[name], fmt,
+                             path)
+
+    def by(self, cls, **attrs):
+        """ return {key: object} of cls whose attributes equal attrs,
+            e.g. by(Review, place_id=pid), foreign keys are looked up
+            through their SQL index """
+        names = self.__names(cls)
+        if not names:
+            return {}
+        name = names[0]
+        fks = [attr for attr in attrs if attr in self.__foreign_keys(name)]
+        objs = {}
+        for id, data in self.__conn.execute(
+                'SELECT id, data FROM "{}"{}'.format(name, ''.join(
+                    (' AND ' if i else ' WHERE ') + attr + ' = ?'
+                    for i, attr in enumerate(fks))),
+                [bindable(attrs[attr]) for attr in fks]):
+            obj = self.__build(name, id, data)
+            if all(getattr(obj, attr, None) == value
+                   for attr, value in attrs.items()):
+                objs[name + "." + id] = obj
+        return objs
+
+    def query(self, cls):
+        """ return a Query over the objects of cls, narrowed with
+            where() and limit() """
+        return Query(self, classes[self.__class_name(cls)])
+
+    def geo(self):
+        """ return the GridIndex of the places, built on first use and
+            kept up to date by new(), delete() and reload() """
+        if self.__geo is None:
+            places = self.all('Place')
+            self.__geo = GridIndex()
+            for key, obj in places.items():
+                self.__geo.add(key, obj)
+        return self.__geo
+
+    def sorted_by(self, cls, attr):
+        """ return the SortedIndex of cls over attr, one of its
+            range_keys, built on first use and kept up to date by
+            new(), delete() and reload() """
+        name = self.__class_name(cls)
+        if attr not in getattr(classes.get(name), 'range_keys', ()):
+            raise ValueError('{} is not a range key of {}'.format(attr, name))
+        objects = self.all(name)
+        ranges = self.__ranges.setdefault(name, {})
+        if attr not in ranges:
+            ranges[attr] = SortedIndex(attr)
+            ranges[attr].build(objects.items())
+        return ranges[attr]
+
+    def bitmap(self, cls, attr):
+        """ return the BitmapIndex of cls over attr, one of its
+            bitmap_keys, built on first use and kept up to date by
+            new(), delete() and reload() """
+        name = self.__class_name(cls)
+        if attr not in getattr(classes.get(name), 'bitmap_keys', ()):
+            raise ValueError('{} is not a bitmap key of {}'.format(attr,
+                                                                   name))
+        objects = self.all(name)
+        bitmaps = self.__bitmaps.setdefault(name, {})
+        if attr not in bitmaps:
+            bitmaps[attr] = BitmapIndex(attr)
+            for key, obj in objects.items():
+                bitmaps[attr].add(key, obj)
+        return bitmaps[attr]
+
+    def materialize(self, name, cls, by=None, agg='count', attr=None):
+        """ declare the View name, agg of attr over the objects of cls
+            per value of by (see View), kept up to date by new(),
+            delete() and reload() from now on, and return it """
+        view = View(self.__class_name(cls), by, agg, attr)
+        view.stale = True
+        for views in self.__views.values():
+            views.pop(name, None)
+        self.__views.setdefault(view.cls, {})[name] = view
+        return self.view(name)
+
+    def view(self, name):
+        """ return the View name declared by materialize(), KeyError if
+            there is none, counted again after reload() """
+        for views in self.__views.values():
+            if name in views:
+                view = views[name]
+                break
+        else:
+            raise KeyError(name)
+        if view.stale:
+            view.clear()
+            for key, obj in self.all(view.cls).items():
+                view.add(key, obj)
+            view.stale = False
+        return view
+
+    def to_columns(self, cls, attrs=None):
+        """ return a Frame of NumPy arrays over attrs of the objects of
+            cls, by default their id, foreign_keys and numeric fields """
+        name = self.__class_name(cls)
+        return Frame.build(classes[name], self.all(name).values(), attrs)
+
+    def text(self):
+        """ return the TextIndex over the text_fields of every class,
+            read back from <path>.text when it was written against the
+            database as it is, else built, and kept up to date by new(),
+            delete() and reload() """
+        if self.__text is None:
+            if not self.__conn.in_transaction:
+                self.__text = TextIndex.load(self.__path + '.text',
+                                             stat((self.__path,)))
+            if self.__text is None:
+                self.__text = TextIndex()
+                for name, cls in classes.items():
+                    if getattr(cls, 'text_fields', ()):
+                        for key, obj in self.all(name).items():
+                            self.__text.add(key, obj)
+        return self.__text
+
+    def search(self, text, cls=None, limit=10):
+        """ return the objects whose text_fields best match the words
+            of text, of cls only if given, best first """
+        names = None if cls is None else {self.__class_name(cls)}
+        objs = [self.get(*key.split('.', 1))
+                for key in self.text().search(text, names, limit)]
+        return [obj for obj in objs if obj is not None]
+
+    def __insert(self, name):
+        """ return the upsert statement of the class name, which keeps
+            the rowid, and so the place, of a row written again """
+        cols = ('id',) + self.__foreign_keys(name) + ('data',)
+        return ('INSERT INTO "{}" ({}) VALUES ({}) ON CONFLICT (id) '
+                'DO UPDATE SET {}'.format(
+                    name, ', '.join(cols), ', '.join('?' * len(cols)),
+                    ', '.join('{0} = excluded.{0}'.format(col)
+                              for col in cols[1:])))
+
+    def __values(self, name, obj):
+        """ return the column values of the row of obj """
+        return ([str(obj.id)] +
+                [bindable(getattr(obj, col))
+                 for col in self.__foreign_keys(name)] +
+                [obj.to_json()])
+
+    def new(self, obj):
+        """ write the row of obj in the current transaction """
+        name = obj.__class__.__name__
+        self.__conn.execute(self.__insert(name), self.__values(name, obj))
+        key = name + "." + str(obj.id)
+        self.__objects[key] = obj
+        self.__changed.pop(key, None)
+        self.__track(name, key, obj)
+
+    def touch(self, obj):
+        """ record obj as changed, its row to be written by the next
+            save(), if it is the object built for its row """
+        key = obj.__class__.__name__ + "." + str(obj.__dict__.get('id'))
+        if self.__objects.get(key) is obj:
+            self.__changed[key] = obj
+
+    def bulk_insert(self, objs, chunk=10000):
+        """ write the rows of every object of the iterable objs, chunk
+            objects at a time with one statement per class, committed
+            once at the end; return how many were written """
+        count = 0
+        objs = iter(objs)
+        with self.batch():
+            while True:
+                part = list(islice(objs, chunk))
+                if not part:
+                    break
+                names = {}
+                for obj in part:
+                    names.setdefault(obj.__class__.__name__, []).append(obj)
+                for name, group in names.items():
+                    self.__conn.executemany(self.__insert(name), (
+                        self.__values(name, obj) for obj in group))
+                    for obj in group:
+                        key = name + "." + str(obj.id)
+                        self.__objects[key] = obj
+                        self.__track(name, key, obj)
+                count += len(part)
+            if count:
+                self.save()
+        return count
+
+    def __track(self, name, key, obj):
+        """ file obj in every index built over class name """
+        for index in self.__ranges.get(name, {}).values():
+            index.add(key, obj)
+        for index in self.__bitmaps.get(name, {}).values():
+            index.add(key, obj)
+        for view in self.__views.get(name, {}).values():
+            if not view.stale:
+                view.add(key, obj)
+        if name == 'Place' and self.__geo is not None:
+            self.__geo.add(key, obj)
+        if self.__text is not None and getattr(obj, 'text_fields', ()):
+            self.__text.add(key, obj)
+
+    def delete(self, obj=None):
+        """ delete the row of obj in the current transaction """
+        if obj is None:
+            return
+        name = obj.__class__.__name__
+        self.__conn.execute('DELETE FROM "{}" WHERE id = ?'.format(name),
+                            (str(obj.id),))
+        key = name + "." + str(obj.id)
+        self.__objects.pop(key, None)
+        self.__changed.pop(key, None)
+        self.__untrack(name, key)
+
+    def __untrack(self, name, key):
+        """ drop key from every index built over class name """
+        for index in self.__ranges.get(name, {}).values():
+            index.remove(key)
+        for index in self.__bitmaps.get(name, {}).values():
+            index.remove(key)
+        for view in self.__views.get(name, {}).values():
+            view.remove(key)
+        if name == 'Place' and self.__geo is not None:
+            self.__geo.remove(key)
+        if self.__text is not None:
+            self.__text.remove(key)
+
+    def save(self):
+        """ write the rows of the objects changed since they were
+            written, then commit the current transaction, unless a
+            batch is open """
+        while self.__changed:
+            self.new(next(iter(self.__changed.values())))
+        self.__pending = True
+        if not self.__depth:
+            self.flush()
+
+    def flush(self):
+        """ commit what was saved so far """
+        if self.__pending:
+            self.__pending = False
+            self.__conn.commit()
+
+    @contextmanager
+    def batch(self):
+        """ commit every save() inside the block at once """
+        self.__depth += 1
+        try:
+            yield self
+        finally:
+            self.__depth -= 1
+            if not self.__depth:
+                self.flush()
+
+    def reload(self):
+        """ (re)connect and create the missing tables and indexes
+            the connection may be used from any thread, one at a time,
+            as the server does from its worker thread """
+        if self.__connection is not None:
+            self.__connection.close()
+        conn = self.__connection = sqlite3.connect(
+            self.__path, check_same_thread=False)
+        self.__objects = {}
+        self.__changed = {}
+        self.__ranges = {}
+        self.__bitmaps = {}
+        self.__geo = None
+        self.__text = None
+        for views in self.__views.values():
+            for view in views.values():
+                view.stale = True
+        for name in classes:
+            fks = self.__foreign_keys(name)
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS "{}" (id TEXT PRIMARY KEY, '
+                '{}data TEXT NOT NULL)'.format(
+                    name, ''.join(col + ' TEXT, ' for col in fks)))
+            for col in fks:
+                conn.execute(
+                    'CREATE INDEX IF NOT EXISTS "{0}_{1}" '
+                    'ON "{0}" ({1})'.format(name, col))
+        conn.commit()
+
+    def close(self):
+        """ commit and close the connection, then write the text index
+            if it is in use and the database changed since it was read
+            or written """
+        if self.__connection is not None:
+            self.flush()
+            clean = not self.__connection.in_transaction
+            self.__connection.close()
+            self.__connection = None
+            stamp = stat((self.__path,))
+            if (clean and self.__text is not None and
+                    self.__text.stamp != stamp):
+                self.__text.dump(self.__path + '.text', stamp)
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+""" export of records to JSON Lines or CSV, one record at a time
+    a record is an instance or a record as kept on disk: a dictionary,
+    a JSON string or a packed binary record, encoded without building
+    its instance """
+import csv
+import json
+import os
+from models.base_model import BaseModel
+from models.engine.layout import encode, unpack
+
+
+formats = ('jsonl', 'csv')
+
+
+def as_json(record):
+    """ return record encoded as JSON """
+    if isinstance(record, BaseModel):
+        return record.to_json()
+    return encode(record)
+
+
+def as_dict(record):
+    """ return record as a dictionary """
+    if isinstance(record, BaseModel):
+        return record.to_dict()
+    if isinstance(record, str):
+        return json.loads(record)
+    return unpack(record)
+
+
+def fields(cls):
+    """ return the CSV columns of cls: id, the dates, then the
+        attributes its class declares with a default value """
+    names = ['id', 'created_at', 'updated_at']
+    numeric = getattr(cls, 'numeric', {})
+    for klass in reversed(cls.__mro__[:cls.__mro__.index(BaseModel)]):
+        for name, value in vars(klass).items():
+            if name.startswith('_') or name in names:
+                continue
+            if name in numeric or (type(value) is not bool and isinstance(
+                    value, (str, int, float, list))):
+                names.append(name)
+    return names
+
+
+def cell(value):
+    """ return value as a CSV cell, lists and dictionaries as JSON """
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return '' if value is None else value
+
+
+def export(records, cls, fmt, path):
+    """ write the records of the class cls to path as JSON Lines (fmt
+        jsonl) or CSV with the columns fields(cls) (fmt csv), an
+        attribute missing from a record taking its class default, through
+        <path>.tmp; return how many were written """
+    if fmt not in formats:
+        raise ValueError('{} is not an export format'.format(fmt))
+    count = 0
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='') as fname:
+        if fmt == 'jsonl':
+            for record in records:
+                fname.write(as_json(record))
+                fname.write('\n')
+                count += 1
+        else:
+            columns = fields(cls)
+            defaults = [getattr(cls, name, None) for name in columns]
+            writer = csv.writer(fname)
+            writer.writerow(columns)
+            for record in records:
+                record = as_dict(record)
+                writer.writerow([cell(record.get(name, default))
+                                 for name, default in zip(columns,
+                                                          defaults)])
+                count += 1
+    os.replace(tmp, path)
+    return count
@@ -2,10 +2,14 @@
 """ class FileStorage
     serializes instances to a JSON file
     and deserializes JSON file to instances """
-import json
+import atexit
 import uuid
 import os
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
 from models.base_model import BaseModel
 from models.user import User
 from models.state import State
@@ -13,33 +17,691 @@ from models.city import City
 from models.amenity import Amenity
 from models.place import Place
 from models.review import Review
+from models.engine import export
+from models.engine.bitmap import BitmapIndex
+from models.engine.frame import Frame
+from models.engine.geo import GridIndex
+from models.engine.journal import Journal
+from models.engine.query import Query
+from models.engine.sorted_index import SortedIndex
+from models.engine.text_index import TextIndex
+from models.engine.view import View
+from models.engine.layout import (JsonLayout, ShardedLayout, BinaryLayout,
+                                  migrate, unpack)
+
+
+classes = {'BaseModel': BaseModel, 'User': User, 'State': State,
+           'City': City, 'Amenity': Amenity, 'Place': Place,
+           'Review': Review}
 
 
 class FileStorage:
     """ construct """
     __file_path = "file.json"
+    __shard_dir = "storage"
+    __binary_path = "file.bin"
     __objects = {}
+    __classes = {}
+    __records = {}
+    __unloaded = set()
+    __indexes = {}
+    __indexed = {}
+    __ranges = {}
+    __bitmaps = {}
+    __geo = None
+    __text = None
+    __views = {}
+    __pages = {}
+    __tracked = __objects
+    __deferred = True
+    __dirty = {}
+    __size = 0
+    __lock = threading.RLock()
+
+    def __init__(self, journal=False, compact_bytes=4 << 20,
+                 compact_ratio=1.0, lazy=False, save_window=0,
+                 layout='json'):
+        """ journal: append changes to <file>.log instead of
+            rewriting the file, compacted once the log is larger
+            than compact_bytes or compact_ratio * the file size
+            lazy: reload keeps the records and builds each object
+            on its first access
+            save_window: seconds during which saves are coalesced
+            into a single write
+            layout: 'json' for the single __file_path file,
+            'sharded' for one <__shard_dir>/<class name>.json file per
+            class where only the files of changed classes are rewritten,
+            'binary' for the __binary_path snapshot read through mmap,
+            where records are only decoded when their object is built """
+        if layout == 'sharded':
+            self.__layout = ShardedLayout(FileStorage.__shard_dir)
+        elif layout == 'binary':
+            self.__layout = BinaryLayout(FileStorage.__binary_path)
+        else:
+            self.__layout = JsonLayout(FileStorage.__file_path)
+        self.__journaled = journal
+        self.__journal = Journal(self.__layout, compact_bytes,
+                                 compact_ratio)
+        self.__lazy = lazy
+        self.__save_window = save_window
+        self.__pending = False
+        self.__depth = 0
+        self.__timer = None
+        atexit.register(self.close)
+
+    @staticmethod
+    def __sync():
+        """ start tracking __objects again if it was replaced, or file
+            the keys added to or removed from it directly """
+        if (FileStorage.__objects is FileStorage.__tracked and
+                len(FileStorage.__objects) !=
+                sum(map(len, FileStorage.__classes.values()))):
+            FileStorage.__resync()
+        if FileStorage.__objects is not FileStorage.__tracked:
+            FileStorage.__tracked = FileStorage.__objects
+            FileStorage.__deferred = False
+            FileStorage.__classes = {}
+            FileStorage.__records = {}
+            FileStorage.__unloaded = set()
+            FileStorage.__indexes = {}
+            FileStorage.__indexed = {}
+            FileStorage.__ranges = {}
+            FileStorage.__bitmaps = {}
+            FileStorage.__geo = None
+            FileStorage.__text = None
+            FileStorage.__pages = {}
+            for views in FileStorage.__views.values():
+                for view in views.values():
+                    view.stale = True
+            for key, obj in FileStorage.__objects.items():
+                FileStorage.__classes.setdefault(
+                    key.split('.', 1)[0], {})[key] = obj
+            FileStorage.__dirty = dict.fromkeys(FileStorage.__objects, True)
+            FileStorage.__size = -1
+
+    @staticmethod
+    def __resync():
+        """ bring the class maps, the indexes and the changes to write
+            in line with __objects, changed without new() or delete() """
+        with FileStorage.__lock:
+            objs = FileStorage.__objects
+            FileStorage.__pages = {}
+            for name, part in FileStorage.__classes.items():
+                for key in [key for key in part if key not in objs]:
+                    del part[key]
+                    FileStorage.__untrack(name, key)
+                    FileStorage.__dirty[key] = False
+            for key, obj in objs.items():
+                name = key.split('.', 1)[0]
+                part = FileStorage.__classes.setdefault(name, {})
+                if key not in part:
+                    part[key] = obj
+                    FileStorage.__records.get(name, {}).pop(key, None)
+                    FileStorage.__dirty[key] = True
+                    FileStorage.__track(name, key, obj)
+            if FileStorage.__size >= 0:
+                FileStorage.__size = len(objs)
+
+    def __ready(self):
+        """ sync, then reload on the first access unless reload() ran
+            or __objects was replaced already """
+        FileStorage.__sync()
+        if FileStorage.__deferred:
+            with FileStorage.__lock:
+                if FileStorage.__deferred:
+                    self.reload()
+
+    @staticmethod
+    def __class_name(cls):
+        """ return the class name of cls, a class or its name """
+        return cls if isinstance(cls, str) else cls.__name__
+
+    @staticmethod
+    def __hydrate(name, records):
+        """ build the objects of the records left in records[name] """
+        with FileStorage.__lock:
+            part = FileStorage.__classes.setdefault(name, {})
+            from_dict = classes[name].from_dict
+            objs = FileStorage.__objects
+            tracked = (name in FileStorage.__indexes or
+                       name in FileStorage.__ranges or
+                       name in FileStorage.__bitmaps or
+                       name in FileStorage.__views or
+                       name == 'Place' and FileStorage.__geo is not None)
+            FileStorage.__pages = {}
+            for key, val in records.pop(name, {}).items():
+                if key not in objs:
+                    FileStorage.__size += 1
+                objs[key] = part[key] = from_dict(unpack(val))
+                if tracked:
+                    FileStorage.__track(name, key, objs[key])
+
+    @staticmethod
+    def __track(name, key, obj):
+        """ file obj in every index built over class name """
+        FileStorage.__index(name, key, obj)
+        for index in FileStorage.__ranges.get(name, {}).values():
+            index.add(key, obj)
+        for index in FileStorage.__bitmaps.get(name, {}).values():
+            index.add(key, obj)
+        for view in FileStorage.__views.get(name, {}).values():
+            if not view.stale:
+                view.add(key, obj)
+        if name == 'Place' and FileStorage.__geo is not None:
+            FileStorage.__geo.add(key, obj)
+        if FileStorage.__text is not None and getattr(obj, 'text_fields',
+                                                      ()):
+            FileStorage.__text.add(key, obj)
+
+    @staticmethod
+    def __untrack(name, key):
+        """ drop key from every index built over class name """
+        FileStorage.__unindex(name, key)
+        for index in FileStorage.__ranges.get(name, {}).values():
+            index.remove(key)
+        for index in FileStorage.__bitmaps.get(name, {}).values():
+            index.remove(key)
+        for view in FileStorage.__views.get(name, {}).values():
+            view.remove(key)
+        if name == 'Place' and FileStorage.__geo is not None:
+            FileStorage.__geo.remove(key)
+        if FileStorage.__text is not None:
+            FileStorage.__text.remove(key)
+
+    @staticmethod
+    def __forget(name):
+        """ drop the indexes built over class name """
+        FileStorage.__indexes.pop(name, None)
+        FileStorage.__indexed.pop(name, None)
+        FileStorage.__ranges.pop(name, None)
+        FileStorage.__bitmaps.pop(name, None)
+        for view in FileStorage.__views.get(name, {}).values():
+            view.stale = True
+        if name == 'Place':
+            FileStorage.__geo = None
+        if getattr(classes.get(name), 'text_fields', ()):
+            FileStorage.__text = None
+
+    @staticmethod
+    def __index(name, key, obj):
+        """ file obj under its foreign keys if class name is indexed,
+            but not under a value that cannot be hashed """
+        index = FileStorage.__indexes.get(name)
+        if index is None:
+            return
+        FileStorage.__unindex(name, key)
+        values = tuple(getattr(obj, attr, None) for attr in index)
+        for attr, value in zip(index, values):
+            try:
+                index[attr].setdefault(value, {})[key] = obj
+            except TypeError:
+                continue
+        FileStorage.__indexed[name][key] = values
+
+    @staticmethod
+    def __unindex(name, key):
+        """ drop key from the foreign key indexes of class name """
+        values = FileStorage.__indexed.get(name, {}).pop(key, None)
+        if values is None:
+            return
+        index = FileStorage.__indexes[name]
+        for attr, value in zip(index, values):
+            try:
+                bucket = index[attr][value]
+            except TypeError:
+                continue
+            del bucket[key]
+            if not bucket:
+                del index[attr][value]
+
+    def all(self, cls=None):
+        """ return dictionary objects, only those of cls if given """
+        self.__ready()
+        if cls is None:
+            self.__load()
+            for name in list(FileStorage.__records):
+                FileStorage.__hydrate(name, FileStorage.__records)
+            return FileStorage.__objects
+        name = self.__class_name(cls)
+        self.__load((name,))
+        if name in FileStorage.__records:
+            FileStorage.__hydrate(name, FileStorage.__records)
+        return FileStorage.__classes.get(name, {})
+
+    def count(self, cls=None):
+        """ return the number of objects, only those of cls if given """
+        self.__ready()
+        if cls is None:
+            self.__load()
+            return len(FileStorage.__objects) + sum(
+                len(part) for part in FileStorage.__records.values())
+        name = self.__class_name(cls)
+        self.__load((name,))
+        return (len(FileStorage.__classes.get(name, {})) +
+                len(FileStorage.__records.get(name, {})))
+
+    def get(self, cls, id):
+        """ return the object of cls with this id, or None """
+        self.__ready()
+        name = self.__class_name(cls)
+        key = name + "." + str(id)
+        self.__load((name,))
+        with FileStorage.__lock:
+            val = FileStorage.__records.get(name, {}).pop(key, None)
+            if val is not None:
+                FileStorage.__hydrate(name, {name: {key: val}})
+        return FileStorage.__objects.get(key)
+
+    def page(self, cls=None, limit=None, offset=0, after=None):
+        """ yield the objects, only those of cls if given, in storage
+            order, starting after the one whose id is after if given,
+            skipping offset more and stopping after limit
+            after is found through the positions of the objects, kept
+            until one is added or removed, so that reading every page
+            costs the same as one pass
+            ValueError if there is no object with the id after """
+        objs = self.all(cls)
+        if after is None:
+            yield from islice(objs.values(), offset,
+                              None if limit is None else offset + limit)
+            return
+        name = None if cls is None else self.__class_name(cls)
+        with FileStorage.__lock:
+            pages = FileStorage.__pages.get(name)
+            if pages is None or len(pages[0]) != len(objs):
+                values = list(objs.values())
+                positions = {}
+                for pos, obj in enumerate(values):
+                    positions.setdefault(str(obj.id), pos)
+                pages = FileStorage.__pages[name] = values, positions
+        values, positions = pages
+        if after not in positions:
+            raise ValueError('no instance with id {}'.format(after))
+        start = positions[after] + 1 + offset
+        yield from islice(values, start,
+                          None if limit is None else start + limit)
+
+    def export(self, cls, fmt, path):
+        """ write the objects of cls to path as JSON Lines (fmt jsonl)
+            or CSV (fmt csv) one at a time, the records of the objects
+            not built yet straight from disk; return how many were
+            written """
+        self.__ready()
+        name = self.__class_name(cls)
+        self.__load((name,))
+        with FileStorage.__lock:
+            raw = FileStorage.__records.get(name, {})
+            objs = FileStorage.__classes.get(name, {})
+            keys = list(raw) + list(objs)
+
+        def records():
+            """ yield the record or object of each key still there """
+            for key in keys:
+                record = raw.get(key)
+                if record is None:
+                    record = objs.get(key)
+                if record is not None:
+                    yield record
+        return export.export(records(), classes[name], fmt, path)
 
-    def all(self):
-        """ return dictionary objects """
-        return FileStorage.__objects
+    def by(self, cls, **attrs):
+        """ return {key: object} of cls whose attributes equal attrs,
+            e.g. by(Review, place_id=pid), foreign keys are looked up
+            in indexes built on first use and kept up to date by new(),
+            delete() and reload(), a value that cannot be hashed by
+            scanning the objects """
+        name = self.__class_name(cls)
+        objs = self.all(name)
+        with FileStorage.__lock:
+            if name in classes and name not in FileStorage.__indexes:
+                FileStorage.__indexes[name] = {
+                    attr: {} for attr in getattr(classes[name],
+                                                 'foreign_keys', ())}
+                FileStorage.__indexed[name] = {}
+                for key, obj in objs.items():
+                    FileStorage.__index(name, key, obj)
+            index = FileStorage.__indexes.get(name, {})
+            for attr, value in attrs.items():
+                if attr in index:
+                    try:
+                        bucket = index[attr].get(value, {})
+                    except TypeError:
+                        continue
+                    if len(bucket) < len(objs):
+                        objs = bucket
+            return {key: obj for key, obj in objs.items()
+                    if all(getattr(obj, attr, None) == value
+                           for attr, value in attrs.items())}
+
+    def query(self, cls):
+        """ return a Query over the objects of cls, narrowed with
+            where() and limit() """
+        return Query(self, classes[self.__class_name(cls)])
+
+    def geo(self):
+        """ return the GridIndex of the places, built on first use and
+            kept up to date by new(), delete() and reload() """
+        places = self.all(Place)
+        with FileStorage.__lock:
+            if FileStorage.__geo is None:
+                FileStorage.__geo = GridIndex()
+                for key, obj in places.items():
+                    FileStorage.__geo.add(key, obj)
+            return FileStorage.__geo
+
+    def sorted_by(self, cls, attr):
+        """ return the SortedIndex of cls over attr, one of its
+            range_keys, built on first use and kept up to date by
+            new(), delete() and reload() """
+        name = self.__class_name(cls)
+        if attr not in getattr(classes.get(name), 'range_keys', ()):
+            raise ValueError('{} is not a range key of {}'.format(attr, name))
+        objs = self.all(name)
+        with FileStorage.__lock:
+            ranges = FileStorage.__ranges.setdefault(name, {})
+            if attr not in ranges:
+                ranges[attr] = SortedIndex(attr)
+                ranges[attr].build(objs.items())
+            return ranges[attr]
+
+    def bitmap(self, cls, attr):
+        """ return the BitmapIndex of cls over attr, one of its
+            bitmap_keys, built on first use and kept up to date by
+            new(), delete() and reload() """
+        name = self.__class_name(cls)
+        if attr not in getattr(classes.get(name), 'bitmap_keys', ()):
+            raise ValueError('{} is not a bitmap key of {}'.format(attr,
+                                                                   name))
+        objs = self.all(name)
+        with FileStorage.__lock:
+            bitmaps = FileStorage.__bitmaps.setdefault(name, {})
+            if attr not in bitmaps:
+                bitmaps[attr] = BitmapIndex(attr)
+                for key, obj in objs.items():
+                    bitmaps[attr].add(key, obj)
+            return bitmaps[attr]
+
+    def materialize(self, name, cls, by=None, agg='count', attr=None):
+        """ declare the View name, agg of attr over the objects of cls
+            per value of by (see View), kept up to date by new(),
+            delete() and reload() from now on, and return it """
+        view = View(self.__class_name(cls), by, agg, attr)
+        view.stale = True
+        with FileStorage.__lock:
+            for views in FileStorage.__views.values():
+                views.pop(name, None)
+            FileStorage.__views.setdefault(view.cls, {})[name] = view
+        return self.view(name)
+
+    def view(self, name):
+        """ return the View name declared by materialize(), KeyError if
+            there is none, counted again if reload() replaced the
+            objects """
+        self.__ready()
+        with FileStorage.__lock:
+            for views in FileStorage.__views.values():
+                if name in views:
+                    view = views[name]
+                    break
+            else:
+                raise KeyError(name)
+            if view.stale:
+                view.clear()
+                for key, obj in self.all(view.cls).items():
+                    view.add(key, obj)
+                view.stale = False
+            return view
+
+    def to_columns(self, cls, attrs=None):
+        """ return a Frame of NumPy arrays over attrs of the objects of
+            cls, by default their id, foreign_keys and numeric fields """
+        name = self.__class_name(cls)
+        return Frame.build(classes[name], self.all(name).values(), attrs)
+
+    def text(self):
+        """ return the TextIndex over the text_fields of every class,
+            read back from the text_path of the layout when it was
+            written against the files as they are, else built, and kept
+            up to date by new(), delete() and reload() """
+        self.__ready()
+        names = [name for name, cls in classes.items()
+                 if getattr(cls, 'text_fields', ())]
+        self.__load(names)
+        with FileStorage.__lock:
+            if FileStorage.__text is None:
+                index = None
+                if FileStorage.__size >= 0:
+                    self.__journal.wait()
+                    index = TextIndex.load(self.__layout.text_path,
+                                           self.__layout.stamp())
+                if index is None:
+                    index = TextIndex()
+                    for name in names:
+                        for key, obj in self.all(name).items():
+                            index.add(key, obj)
+                else:
+                    objs = FileStorage.__objects
+                    for key, alive in FileStorage.__dirty.items():
+                        if alive:
+                            index.add(key, objs[key])
+                        else:
+                            index.remove(key)
+                FileStorage.__text = index
+            return FileStorage.__text
+
+    def search(self, text, cls=None, limit=10):
+        """ return the objects whose text_fields best match the words
+            of text, of cls only if given, best first """
+        names = None if cls is None else {self.__class_name(cls)}
+        objs = [self.get(*key.split('.', 1))
+                for key in self.text().search(text, names, limit)]
+        return [obj for obj in objs if obj is not None]
 
     def new(self, obj):
         """ sets in dictionary the obj with key <obj class name>.id """
-        FileStorage.__objects[obj.__class__.__name__ + "." + str(obj.id)] = obj
+        with FileStorage.__lock:
+            self.__ready()
+            name = obj.__class__.__name__
+            key = name + "." + str(obj.id)
+            FileStorage.__records.get(name, {}).pop(key, None)
+            if key not in FileStorage.__objects:
+                FileStorage.__size += 1
+                FileStorage.__pages = {}
+            FileStorage.__objects[key] = obj
+            FileStorage.__classes.setdefault(name, {})[key] = obj
+            FileStorage.__dirty[key] = True
+            FileStorage.__track(name, key, obj)
+
+    def touch(self, obj):
+        """ mark obj changed, to be written by the next save() in
+            journal and sharded modes, if it is the object stored under
+            its key; nothing is loaded """
+        key = obj.__class__.__name__ + "." + str(obj.__dict__.get('id'))
+        if FileStorage.__objects.get(key) is obj:
+            with FileStorage.__lock:
+                FileStorage.__dirty[key] = True
+
+    def bulk_insert(self, objs, chunk=10000):
+        """ add every object of the iterable objs, chunk objects at a
+            time, saved once at the end; return how many were added """
+        count = 0
+        objs = iter(objs)
+        with self.batch():
+            while True:
+                part = list(islice(objs, chunk))
+                if not part:
+                    break
+                with FileStorage.__lock:
+                    for obj in part:
+                        self.new(obj)
+                count += len(part)
+            if count:
+                self.save()
+        return count
+
+    def delete(self, obj=None):
+        """ deletes obj from __objects """
+        if obj is None:
+            return
+        with FileStorage.__lock:
+            self.__ready()
+            name = obj.__class__.__name__
+            key = name + "." + str(obj.id)
+            if FileStorage.__objects.pop(key, None) is not None:
+                FileStorage.__classes[name].pop(key, None)
+                FileStorage.__untrack(name, key)
+                FileStorage.__size -= 1
+                FileStorage.__pages = {}
+                FileStorage.__dirty[key] = False
 
     def save(self):
+        """ serializes objects to the JSON file, deferred while a
+            batch is open or until save_window has elapsed """
+        with FileStorage.__lock:
+            self.__ready()
+            self.__pending = True
+            if self.__depth:
+                return
+            if not self.__save_window:
+                self.flush()
+            elif self.__timer is None:
+                self.__timer = threading.Timer(self.__save_window,
+                                               self.flush)
+                self.__timer.daemon = True
+                self.__timer.start()
+
+    def flush(self):
+        """ write the saves deferred so far """
+        with FileStorage.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+            if self.__pending:
+                self.__pending = False
+                self.__write()
+
+    @contextmanager
+    def batch(self):
+        """ coalesce every save() inside the block into one write """
+        with FileStorage.__lock:
+            self.__depth += 1
+        try:
+            yield self
+        finally:
+            with FileStorage.__lock:
+                self.__depth -= 1
+            if not self.__depth:
+                self.flush()
+
+    def __write(self):
         """ serializes objectss to the JSON file (path: __file_path) """
-        with open(FileStorage.__file_path, 'w', encoding='utf-8') as fname:
-            new_dict = {key: obj.to_dict() for key, obj in
-                        FileStorage.__objects.items()}
-            json.dump(new_dict, fname)
+        FileStorage.__sync()
+        objs = FileStorage.__objects
+        if self.__journaled and FileStorage.__size == len(objs):
+            self.__journal.append(
+                [(key, objs[key].to_json() if alive else None)
+                 for key, alive in FileStorage.__dirty.items()])
+        else:
+            names = None
+            if (self.__layout.sharded and not self.__journal.exists() and
+                    FileStorage.__size == len(objs)):
+                names = {key.split('.', 1)[0] for key in FileStorage.__dirty}
+            self.__load(names)
+            if names is None:
+                names = set(FileStorage.__classes) | set(FileStorage.__records)
+            records = {}
+            for name in names:
+                records.update(FileStorage.__records.get(name, {}))
+                for key, obj in FileStorage.__classes.get(name, {}).items():
+                    records[key] = obj.to_json()
+            self.__journal.wait()
+            self.__layout.dump(records, names)
+            self.__journal.truncate()
+        FileStorage.__dirty.clear()
+        FileStorage.__size = len(objs)
+
+    def close(self):
+        """ write the deferred saves, then the text index if it is in
+            use and the files changed since it was read or written """
+        with FileStorage.__lock:
+            self.flush()
+            index = FileStorage.__text
+            if (index is None or FileStorage.__dirty or
+                    FileStorage.__size < 0):
+                return
+            self.__journal.wait()
+            stamp = self.__layout.stamp()
+            if index.stamp != stamp:
+                index.dump(self.__layout.text_path, stamp)
+
+    def compact(self):
+        """ fold the journal into the JSON file now """
+        self.__journal.wait()
+        self.__journal.compact()
+
+    def __load(self, names=None):
+        """ read the records of the classes names (or all) that are
+            still on disk """
+        with FileStorage.__lock:
+            if names is None:
+                names = set(FileStorage.__unloaded)
+            else:
+                names = FileStorage.__unloaded.intersection(names)
+            if not names:
+                return
+            FileStorage.__unloaded -= names
+            self.__apply(self.__journal.load(names))
+
+    def __apply(self, loaded):
+        """ replace the objects in memory by the loaded records """
+        objs = FileStorage.__objects
+        FileStorage.__pages = {}
+        keys = sorted(loaded)
+        records = {}
+        for name in classes:
+            lo = bisect_left(keys, name + '.')
+            hi = bisect_left(keys, name + '/', lo)
+            if lo < hi:
+                records[name] = dict(zip(keys[lo:hi],
+                                         map(loaded.__getitem__,
+                                             keys[lo:hi])))
+        for name, part in records.items():
+            FileStorage.__forget(name)
+            if self.__lazy:
+                raw = FileStorage.__records.setdefault(name, {})
+            else:
+                raw = FileStorage.__records.get(name, {})
+            if objs or FileStorage.__dirty or raw:
+                hydrated = FileStorage.__classes.get(name, {})
+                for key in part:
+                    FileStorage.__dirty.pop(key, None)
+                    if not self.__lazy:
+                        raw.pop(key, None)
+                    elif objs.pop(key, None) is not None:
+                        del hydrated[key]
+                        FileStorage.__size -= 1
+            if self.__lazy:
+                raw.update(part)
+        if not self.__lazy:
+            for name in list(records):
+                FileStorage.__hydrate(name, records)
+        if FileStorage.__size < 0 and not FileStorage.__dirty:
+            FileStorage.__size = len(objs)
 
     def reload(self):
         """ Reload the file """
-        if (os.path.isfile(FileStorage.__file_path)):
-            with open(FileStorage.__file_path, 'r', encoding="utf-8") as fname:
-                l_json = json.load(fname)
-                for key, val in l_json.items():
-                    FileStorage.__objects[key] = eval(
-                        val['__class__'])(**val)
+        with FileStorage.__lock:
+            FileStorage.__sync()
+            FileStorage.__deferred = False
+            if (type(self.__layout) is not JsonLayout and
+                    not self.__layout.exists() and
+                    os.path.isfile(FileStorage.__file_path)):
+                migrate(Journal(JsonLayout(FileStorage.__file_path)),
+                        self.__layout)
+            if self.__lazy and self.__layout.sharded:
+                FileStorage.__unloaded = set(classes)
+            else:
+                FileStorage.__unloaded = set()
+                self.__apply(self.__journal.load())
+            if FileStorage.__size < 0 and not FileStorage.__dirty:
+                FileStorage.__size = len(FileStorage.__objects)
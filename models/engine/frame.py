@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+""" class Frame
+    the attributes of the objects of a class as NumPy arrays, the id
+    fields encoded as categories, with vectorized group-by aggregates """
+from math import nan
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+aggregates = ('count', 'sum', 'mean', 'min', 'max')
+
+
+def references(attr):
+    """ return the name of the class the foreign key attr points to,
+        e.g. City for city_id """
+    return ''.join(part.capitalize() for part in attr[:-3].split('_'))
+
+
+def numbers(values, typecode='d'):
+    """ return values as an int64 ('q') or float64 ('d') array, as
+        float64 with nan for the values that are not numbers if any """
+    try:
+        return numpy.array(values, numpy.int64 if typecode == 'q'
+                           else numpy.float64)
+    except (TypeError, ValueError, OverflowError):
+        return numpy.array([value if isinstance(value, (int, float)) and
+                            not isinstance(value, bool) else nan
+                            for value in values], numpy.float64)
+
+
+def encode(values):
+    """ return (codes, categories) of values, categories[codes[i]]
+        being values[i] """
+    index = {}
+    codes = numpy.fromiter((index.setdefault(value, len(index))
+                            for value in values), numpy.intp, len(values))
+    return codes, list(index)
+
+
+class Frame:
+    """ {attr: array}, for each attr in categories an array of codes
+        into its list of categories """
+
+    def __init__(self, columns, categories, length):
+        """ frame of length rows """
+        self.columns = columns
+        self.categories = categories
+        self.length = length
+
+    def __len__(self):
+        """ return the number of rows """
+        return self.length
+
+    @classmethod
+    def build(cls, model, objs, attrs=None):
+        """ return the Frame of objs, objects of the class model, over
+            attrs, by default its id, foreign_keys and numeric fields
+            id and *_id attributes, and those holding something else
+            than numbers, are encoded as categories """
+        if numpy is None:
+            raise ImportError('to_columns needs NumPy')
+        objs = list(objs)
+        numeric = getattr(model, 'numeric', {})
+        if attrs is None:
+            attrs = (('id',) + tuple(getattr(model, 'foreign_keys', ())) +
+                     tuple(numeric))
+        columns, categories = {}, {}
+        for attr in attrs:
+            values = [getattr(obj, attr, None) for obj in objs]
+            if attr in numeric:
+                columns[attr] = numbers(values, numeric[attr])
+            elif attr != 'id' and not attr.endswith('_id') and all(
+                    isinstance(value, (int, float)) and
+                    not isinstance(value, bool) for value in values):
+                columns[attr] = numbers(values)
+            else:
+                columns[attr], categories[attr] = encode(values)
+        return cls(columns, categories, len(objs))
+
+    def decode(self, attr):
+        """ return the values of attr, row by row """
+        if attr in self.categories:
+            return list(map(self.categories[attr].__getitem__,
+                            self.columns[attr].tolist()))
+        return self.columns[attr].tolist()
+
+    def follow(self, by, other, attr):
+        """ return a Frame with, as by.attr, the attr of the row of
+            other whose id is the category by of each row, e.g. the
+            state_id of the city_id of each place, None if there is
+            no such row """
+        mapping = dict(zip(other.decode('id'), other.decode(attr)))
+        codes, categories = encode([mapping.get(value)
+                                    for value in self.categories[by]])
+        name = by + '.' + attr
+        return Frame(dict(self.columns, **{name: codes[self.columns[by]]}),
+                     dict(self.categories, **{name: categories}),
+                     self.length)
+
+    def group(self, by, agg='count', attr=None):
+        """ return {category of by: agg of attr over its rows}, agg one
+            of count, sum, mean, min, max, count needing no attr
+            rows where attr is nan are left out """
+        if by not in self.categories:
+            raise ValueError('{} is not a category'.format(by))
+        if agg not in aggregates:
+            raise ValueError('{} is not an aggregate'.format(agg))
+        codes = self.columns[by]
+        size = len(self.categories[by])
+        values = None
+        if agg != 'count' or attr is not None:
+            if attr not in self.columns or attr in self.categories:
+                raise ValueError('{} is not a number column'.format(attr))
+            values = self.columns[attr]
+            if values.dtype.kind == 'f':
+                known = ~numpy.isnan(values)
+                codes, values = codes[known], values[known]
+        counts = numpy.bincount(codes, minlength=size)
+        if agg == 'count':
+            result = counts
+        elif agg == 'mean':
+            result = (numpy.bincount(codes, values, size) /
+                      numpy.maximum(counts, 1))
+        elif not len(values):
+            result = counts
+        else:
+            ufunc = {'sum': numpy.add, 'min': numpy.minimum,
+                     'max': numpy.maximum}[agg]
+            start = {'sum': 0, 'min': values.max(), 'max': values.min()}
+            result = numpy.full(size, start[agg], values.dtype)
+            ufunc.at(result, codes, values)
+        return {self.categories[by][i]: result[i].item()
+                for i in numpy.flatnonzero(counts).tolist()}
+
+
+def stats(storage, cls, by, agg='count', attr=None):
+    """ return {value of by: agg of attr} over the objects of cls in
+        storage, by being an attribute or a path through foreign keys
+        such as city_id.state_id """
+    path = by.split('.')
+    frame = storage.to_columns(cls, tuple(dict.fromkeys(
+        name for name in (path[0], attr) if name is not None)))
+    key = path[0]
+    for link in path[1:]:
+        target = references(key.rsplit('.', 1)[-1])
+        frame = frame.follow(key, storage.to_columns(target, ('id', link)),
+                             link)
+        key += '.' + link
+    return frame.group(key, agg, attr)
@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+""" class GridIndex
+    spatial index of objects by latitude and longitude, kept in a grid
+    of cells of a few degrees """
+from math import asin, cos, floor, radians, sin, sqrt
+
+
+earth_radius = 6371.0088
+km_per_degree = radians(earth_radius)
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """ return the great-circle distance in km between two points """
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    hav = (sin((lat2 - lat1) / 2) ** 2 +
+           cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2)
+    return 2 * earth_radius * asin(min(1.0, sqrt(hav)))
+
+
+class GridIndex:
+    """ objects filed in cells of size x size degrees """
+
+    def __init__(self, size=0.5):
+        """ empty grid of cells of size degrees """
+        self.size = size
+        self.cells = {}
+        self.points = {}
+
+    def __len__(self):
+        """ return the number of objects indexed """
+        return len(self.points)
+
+    def cell(self, lat, lon):
+        """ return the cell holding the point lat, lon """
+        return floor(lat / self.size), floor(lon / self.size)
+
+    def add(self, key, obj):
+        """ file obj under its latitude and longitude, moving it if it
+            was filed before, objects without numeric ones are left out """
+        self.remove(key)
+        try:
+            lat, lon = float(obj.latitude), float(obj.longitude)
+        except (AttributeError, TypeError, ValueError):
+            return
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            return
+        cell = self.cell(lat, lon)
+        self.cells.setdefault(cell, {})[key] = obj
+        self.points[key] = (lat, lon, cell)
+
+    def remove(self, key):
+        """ drop key from the grid """
+        point = self.points.pop(key, None)
+        if point is not None:
+            bucket = self.cells[point[2]]
+            del bucket[key]
+            if not bucket:
+                del self.cells[point[2]]
+
+    def __candidates(self, south, west, north, east):
+        """ yield the keys of the cells overlapping the box, a box with
+            west > east crosses the antimeridian """
+        lats = range(floor(south / self.size), floor(north / self.size) + 1)
+        if west <= east:
+            lons = [range(floor(west / self.size),
+                          floor(east / self.size) + 1)]
+        else:
+            lons = [range(floor(west / self.size),
+                          floor(180 / self.size) + 1),
+                    range(floor(-180 / self.size),
+                          floor(east / self.size) + 1)]
+        if len(lats) * sum(map(len, lons)) > len(self.cells):
+            cells = [bucket for (ilat, ilon), bucket in self.cells.items()
+                     if ilat in lats and any(ilon in rng for rng in lons)]
+        else:
+            cells = [self.cells[(ilat, ilon)] for ilat in lats
+                     for rng in lons for ilon in rng
+                     if (ilat, ilon) in self.cells]
+        for bucket in cells:
+            yield from bucket
+
+    def within_bbox(self, south, west, north, east):
+        """ return the objects with south <= latitude <= north and
+            longitude between west and east """
+        found = []
+        for key in self.__candidates(south, west, north, east):
+            lat, lon, cell = self.points[key]
+            if south <= lat <= north and (
+                    west <= lon <= east if west <= east
+                    else lon >= west or lon <= east):
+                found.append(self.cells[cell][key])
+        return found
+
+    def within_radius(self, lat, lon, km):
+        """ return the objects at most km away from lat, lon,
+            nearest first """
+        return [obj for dist, key, obj in self.__around(lat, lon, km)]
+
+    def __around(self, lat, lon, km):
+        """ return sorted (distance, key, object) within km """
+        dlat = km / km_per_degree
+        south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        scale = min(cos(radians(south)), cos(radians(north)))
+        if south <= -90 or north >= 90 or km >= scale * 180 * km_per_degree:
+            west, east = -180.0, 180.0
+        else:
+            dlon = km / (km_per_degree * scale)
+            west, east = lon - dlon, lon + dlon
+            if west < -180:
+                west += 360
+            if east > 180:
+                east -= 360
+        found = []
+        for key in self.__candidates(south, west, north, east):
+            plat, plon, cell = self.points[key]
+            dist = distance(lat, lon, plat, plon)
+            if dist <= km:
+                found.append((dist, key, self.cells[cell][key]))
+        found.sort(key=lambda item: item[:2])
+        return found
+
+    def nearest(self, lat, lon, k):
+        """ return the k objects nearest to lat, lon, nearest first,
+            none if k is not positive """
+        if k <= 0:
+            return []
+        km = self.size * km_per_degree
+        while True:
+            found = self.__around(lat, lon, km)
+            if len(found) >= k or km > earth_radius * 4:
+                break
+            km *= 2
+        return [obj for dist, key, obj in found[:k]]
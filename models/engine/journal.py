@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+""" class Journal
+    append-only log of changes written next to the snapshot,
+    replayed on reload and compacted into the snapshot """
+import atexit
+import json
+import os
+import threading
+from models.engine.layout import encode
+
+
+class Journal:
+    """ log of set/del records over the snapshot of a layout """
+
+    def __init__(self, layout, compact_bytes=4 << 20, compact_ratio=1.0):
+        """ journal kept in layout.log_path """
+        self.layout = layout
+        self.log_path = layout.log_path
+        self.compact_bytes = compact_bytes
+        self.compact_ratio = compact_ratio
+        self.lock = threading.RLock()
+        self.__append_lock = threading.Lock()
+        self.__compactor = None
+        atexit.register(self.wait)
+
+    def append(self, changes):
+        """ log [(key, record or None)], a None record is a destroy
+            and a record may already be encoded as JSON """
+        lines = []
+        for key, record in changes:
+            if record is None:
+                lines.append(json.dumps({'op': 'del', 'key': key}))
+            else:
+                lines.append('{"op": "set", "key": ' + json.dumps(key) +
+                             ', "obj": ' + encode(record) + '}')
+        if not lines:
+            return
+        with self.__append_lock:
+            os.makedirs(os.path.dirname(self.log_path) or '.',
+                        exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as fname:
+                fname.write('\n'.join(lines) + '\n')
+        if self.needs_compaction():
+            self.compact_in_background()
+
+    def entries(self, end=None):
+        """ yield the log entries (up to byte offset end) """
+        if not os.path.isfile(self.log_path):
+            return
+        with open(self.log_path, 'rb') as fname:
+            data = fname.read() if end is None else fname.read(end)
+        for line in data.splitlines():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                return
+
+    def replay(self, records, names=None, end=None):
+        """ apply the log entries of classes names (or all) """
+        for entry in self.entries(end):
+            key = entry['key']
+            if names is not None and key.split('.', 1)[0] not in names:
+                continue
+            if entry['op'] == 'set':
+                records[key] = entry['obj']
+            else:
+                records.pop(key, None)
+        return records
+
+    def load(self, names=None):
+        """ return the snapshot records of names (or all) with the
+            log replayed """
+        with self.lock:
+            return self.replay(self.layout.load(names), names)
+
+    def exists(self):
+        """ True while the log holds entries not in the snapshot """
+        return os.path.isfile(self.log_path)
+
+    def truncate(self):
+        """ drop the log once a full snapshot has been written """
+        self.wait()
+        with self.lock, self.__append_lock:
+            if os.path.isfile(self.log_path):
+                os.remove(self.log_path)
+
+    def needs_compaction(self):
+        """ True once the log crossed the size or ratio threshold """
+        try:
+            log_size = os.path.getsize(self.log_path)
+        except OSError:
+            return False
+        if log_size >= self.compact_bytes:
+            return True
+        snap_size = self.layout.size()
+        return bool(snap_size) and log_size >= self.compact_ratio * snap_size
+
+    def compact(self):
+        """ fold the log into a fresh snapshot """
+        with self.__append_lock:
+            if not os.path.isfile(self.log_path):
+                return
+            end = os.path.getsize(self.log_path)
+        names = None
+        if self.layout.sharded:
+            names = {entry['key'].split('.', 1)[0]
+                     for entry in self.entries(end)}
+        records = self.replay(self.layout.load(names), names, end)
+        with self.lock:
+            self.layout.dump(records, names)
+            with self.__append_lock:
+                with open(self.log_path, 'rb') as fname:
+                    fname.seek(end)
+                    tail = fname.read()
+                if tail:
+                    with open(self.log_path + '.tmp', 'wb') as fname:
+                        fname.write(tail)
+                    os.replace(self.log_path + '.tmp', self.log_path)
+                else:
+                    os.remove(self.log_path)
+
+    def compact_in_background(self):
+        """ start compact() in a thread unless one is running """
+        if self.__compactor is not None and self.__compactor.is_alive():
+            return
+        self.__compactor = threading.Thread(target=self.compact,
+                                            daemon=True)
+        self.__compactor.start()
+
+    def wait(self):
+        """ block until a background compaction is done """
+        if self.__compactor is not None:
+            self.__compactor.join()
@@ -0,0 +1,260 @@
+#!/usr/bin/python3
+""" on-disk layouts of FileStorage
+    JsonLayout keeps every object in one JSON file,
+    ShardedLayout keeps one JSON file per class,
+    BinaryLayout keeps an indexed binary file read through mmap """
+import gc
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import repeat
+
+
+def load_json(path):
+    """ return the records saved in the JSON file at path """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as fname:
+        return json.load(fname)
+
+
+def packed(record):
+    """ True if record is a (data, offset) pair still encoded in a
+        mapped binary snapshot """
+    return type(record) is tuple
+
+
+def raw(record):
+    """ return the JSON bytes of a packed record """
+    data, offset = record
+    size, = struct.unpack_from('<I', data, offset)
+    return data[offset + 4:offset + 4 + size]
+
+
+def unpack(record):
+    """ return record as a dictionary, decoding it if still packed """
+    return json.loads(raw(record)) if packed(record) else record
+
+
+def encode(record):
+    """ return record as JSON, unless it already is a JSON string """
+    if isinstance(record, str):
+        return record
+    if packed(record):
+        return raw(record).decode('utf-8')
+    return json.dumps(record)
+
+
+def stat(paths):
+    """ return [path, size, modification time] of each file of paths
+        that exists, which changes whenever one of them is written """
+    found = []
+    for path in paths:
+        try:
+            info = os.stat(path)
+        except OSError:
+            continue
+        found.append([path, info.st_size, info.st_mtime_ns])
+    return found
+
+
+def dump_json(path, records):
+    """ write records to the JSON file at path, atomically
+        records encoded already are spliced in unchanged """
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fname:
+        fname.write('{' + ', '.join(json.dumps(key) + ': ' + encode(record)
+                                    for key, record in records.items()))
+        fname.write('}')
+    os.replace(tmp, path)
+
+
+class JsonLayout:
+    """ every record in a single file, <path>.log next to it """
+    sharded = False
+
+    def __init__(self, path):
+        """ layout of the file at path """
+        self.path = path
+        self.log_path = path + '.log'
+        self.text_path = path + '.text'
+
+    def load(self, names=None):
+        """ return {key: record}, always for every class """
+        return load_json(self.path)
+
+    def dump(self, records, names=None):
+        """ write every record, names is ignored """
+        dump_json(self.path, records)
+
+    def exists(self):
+        """ True once the file was written """
+        return os.path.isfile(self.path)
+
+    def size(self):
+        """ return the size in bytes of the file """
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def stamp(self):
+        """ return the stat() of the file and its log """
+        return stat((self.path, self.log_path))
+
+
+class ShardedLayout:
+    """ one <directory>/<class name>.json file per class """
+    sharded = True
+
+    def __init__(self, directory):
+        """ layout of the shards in directory """
+        self.directory = directory
+        self.log_path = os.path.join(directory, 'journal.log')
+        self.text_path = os.path.join(directory, 'text.index')
+
+    def shard(self, name):
+        """ return the path of the shard of class name """
+        return os.path.join(self.directory, name + '.json')
+
+    def names(self):
+        """ return the class names that have a shard """
+        if not os.path.isdir(self.directory):
+            return []
+        return [fname[:-5] for fname in os.listdir(self.directory)
+                if fname.endswith('.json')]
+
+    def load(self, names=None):
+        """ return {key: record} of the shards of names, or all """
+        records = {}
+        for name in self.names() if names is None else names:
+            records.update(load_json(self.shard(name)))
+        return records
+
+    def dump(self, records, names=None):
+        """ rewrite the shards of names, or all of them, with records
+            a shard left without records is removed """
+        shards = {}
+        for key, record in records.items():
+            shards.setdefault(key.split('.', 1)[0], {})[key] = record
+        if names is None:
+            names = set(self.names()) | set(shards)
+        os.makedirs(self.directory, exist_ok=True)
+        for name in names:
+            if name in shards:
+                dump_json(self.shard(name), shards[name])
+            elif os.path.isfile(self.shard(name)):
+                os.remove(self.shard(name))
+
+    def size(self):
+        """ return the size in bytes of every shard """
+        return sum(os.path.getsize(self.shard(name))
+                   for name in self.names())
+
+    def exists(self):
+        """ True once the directory was created """
+        return os.path.isdir(self.directory)
+
+    def stamp(self):
+        """ return the stat() of every shard and of the log """
+        return stat([self.shard(name) for name in sorted(self.names())] +
+                    [self.log_path])
+
+
+class BinaryLayout:
+    """ every record in a single binary file made of
+        a header: magic, version, record count, key table size,
+        the key table: every key followed by a newline,
+        the offset table: the offset of each record, in key order,
+        the records: length then JSON bytes, per record """
+    sharded = False
+    magic = b'HBNB'
+    version = 1
+    header = struct.Struct('<4sHQQ')
+    length = struct.Struct('<I')
+
+    def __init__(self, path):
+        """ layout of the file at path, <path>.log next to it """
+        self.path = path
+        self.log_path = path + '.log'
+        self.text_path = path + '.text'
+
+    def load(self, names=None):
+        """ return {key: packed record}, always for every class
+            only the key and offset tables are read """
+        if not os.path.isfile(self.path) or not os.path.getsize(self.path):
+            return {}
+        with open(self.path, 'rb') as fname:
+            data = mmap.mmap(fname.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) < self.header.size:
+            raise ValueError('{} is not a snapshot'.format(self.path))
+        magic, version, count, keys_size = self.header.unpack_from(data, 0)
+        if magic != self.magic or version != self.version:
+            raise ValueError('{} is not a snapshot'.format(self.path))
+        pos = self.header.size
+        keys = data[pos:pos + keys_size].decode('utf-8').split('\n')
+        pos += keys_size
+        offsets = array('Q', data[pos:pos + 8 * count])
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        collect = gc.isenabled()
+        gc.disable()
+        try:
+            return dict(zip(keys, zip(repeat(data, count), offsets)))
+        finally:
+            if collect:
+                gc.enable()
+
+    def dump(self, records, names=None):
+        """ write every record in key order, names is ignored """
+        order = sorted(records)
+        keys = '\n'.join(order).encode('utf-8') + b'\n' if order else b''
+        blobs = [raw(record) if packed(record)
+                 else encode(record).encode('utf-8')
+                 for record in map(records.__getitem__, order)]
+        offsets = array('Q')
+        pos = self.header.size + len(keys) + 8 * len(blobs)
+        for blob in blobs:
+            offsets.append(pos)
+            pos += self.length.size + len(blob)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as fname:
+            fname.write(self.header.pack(self.magic, self.version,
+                                         len(blobs), len(keys)))
+            fname.write(keys)
+            fname.write(offsets.tobytes())
+            for blob in blobs:
+                fname.write(self.length.pack(len(blob)))
+                fname.write(blob)
+        os.replace(tmp, self.path)
+
+    def size(self):
+        """ return the size in bytes of the file """
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def exists(self):
+        """ True once the file was written """
+        return os.path.isfile(self.path)
+
+    def stamp(self):
+        """ return the stat() of the file and its log """
+        return stat((self.path, self.log_path))
+
+
+def migrate(journal, layout):
+    """ move the records of journal (a Journal over a JsonLayout)
+        into layout, keeping the old file as <file>.bak """
+    old = journal.layout
+    layout.dump(journal.load())
+    if os.path.isfile(old.path):
+        os.replace(old.path, old.path + '.bak')
+    if os.path.isfile(old.log_path):
+        os.remove(old.log_path)
@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+""" class Query
+    lazy filtered iteration over the objects of one class,
+    planned over the indexes of the storage """
+import heapq
+from collections.abc import Hashable
+from itertools import islice
+from models.engine.columns import operators
+
+
+def parse(condition):
+    """ return (attribute, op) of a <attribute>__<op> condition """
+    attr, _, op = condition.partition('__')
+    if not attr or (op or 'eq') not in operators:
+        raise ValueError('unknown condition ' + condition)
+    return attr, op or 'eq'
+
+
+def numeric(value):
+    """ True if value can bound a sorted index or a typed column """
+    return isinstance(value, (int, float))
+
+
+def matches(obj, tests):
+    """ True if obj passes every (attribute, op, value) test """
+    for attr, op, value in tests:
+        try:
+            if not operators[op](getattr(obj, attr, None), value):
+                return False
+        except TypeError:
+            return False
+    return True
+
+
+class Query:
+    """ the objects of cls in storage matching every condition """
+
+    def __init__(self, storage, cls, conditions=None, count=None,
+                 order=None):
+        """ query over the objects of the class cls of storage """
+        self.storage = storage
+        self.cls = cls
+        self.conditions = dict(conditions or {})
+        self.count = count
+        self.order = order
+
+    def __copy(self, **changes):
+        """ return this query with some of its settings changed """
+        settings = dict(conditions=self.conditions, count=self.count,
+                        order=self.order)
+        settings.update(changes)
+        return Query(self.storage, self.cls, **settings)
+
+    def where(self, **conditions):
+        """ return a query also matching <attribute>__<op>=value,
+            op one of eq (the default), ne, lt, lte, gt, gte """
+        for condition in conditions:
+            parse(condition)
+        return self.__copy(conditions=dict(self.conditions, **conditions))
+
+    def limit(self, count):
+        """ return a query stopping after count objects """
+        if count is not None and (type(count) is not int or count < 0):
+            raise ValueError('invalid limit {}'.format(count))
+        return self.__copy(count=count)
+
+    def order_by(self, attr):
+        """ return a query yielding objects by increasing attr, or
+            decreasing with a leading '-', ties by id """
+        if not isinstance(attr, str) or not attr.lstrip('-'):
+            raise ValueError('invalid order {}'.format(attr))
+        return self.__copy(order=attr)
+
+    def plan(self):
+        """ return how candidates are found: ('index', condition) for
+            an equality on a foreign key to a hashable value,
+            ('range', attribute) through the sorted index of a range
+            key that has numeric conditions or is the order,
+            ('columns', conditions) for numeric conditions on typed
+            columns, else ('scan', None) """
+        fks = getattr(self.cls, 'foreign_keys', ())
+        range_keys = getattr(self.cls, 'range_keys', ())
+        bounded = []
+        for condition, value in self.conditions.items():
+            attr, op = parse(condition)
+            if attr in fks and op == 'eq' and isinstance(value, Hashable):
+                return 'index', condition
+            if attr in range_keys and op != 'ne' and numeric(value):
+                bounded.append(attr)
+        order = (self.order or '').lstrip('-')
+        if bounded:
+            return 'range', order if order in bounded else bounded[0]
+        if order in range_keys:
+            return 'range', order
+        columns = getattr(self.cls, 'columns', None)
+        if columns is not None:
+            found = [condition
+                     for condition, value in self.conditions.items()
+                     if parse(condition)[0] in columns.columns and
+                     numeric(value)]
+            if found:
+                return 'columns', found
+        return 'scan', None
+
+    def candidates(self):
+        """ return the objects the plan narrows the query to """
+        path, using = self.plan()
+        if path == 'index':
+            return self.storage.by(self.cls, **{
+                using: self.conditions[using]}).values()
+        if path == 'range':
+            bounds = {}
+            for condition, value in self.conditions.items():
+                attr, op = parse(condition)
+                if attr != using or not numeric(value):
+                    continue
+                if op in ('eq', 'gt', 'gte'):
+                    bounds.setdefault('low', value)
+                    bounds.setdefault('low_open', op == 'gt')
+                if op in ('eq', 'lt', 'lte'):
+                    bounds.setdefault('high', value)
+                    bounds.setdefault('high_open', op == 'lt')
+            return self.storage.sorted_by(self.cls, using).range(
+                reverse=self.order == '-' + using, **bounds)
+        if path == 'columns':
+            return self.cls.filter(**{condition: self.conditions[condition]
+                                      for condition in using})
+        return self.storage.all(self.cls).values()
+
+    def __iter__(self):
+        """ yield the candidates matching every condition, in order """
+        tests = [parse(condition) + (value,)
+                 for condition, value in self.conditions.items()]
+        objs = (obj for obj in self.candidates() if matches(obj, tests))
+        path, using = self.plan()
+        order = (self.order or '').lstrip('-')
+        if order and (path, using) != ('range', order):
+            reverse = self.order.startswith('-')
+
+            def key(obj):
+                """ sort on the attribute then the id """
+                return getattr(obj, order, None), obj.id
+            if self.count is None:
+                objs = iter(sorted(objs, key=key, reverse=reverse))
+            else:
+                pick = heapq.nlargest if reverse else heapq.nsmallest
+                objs = iter(pick(self.count, objs, key))
+        yield from islice(objs, self.count)
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+""" class SortedIndex
+    objects kept in order of one numeric attribute, for range
+    lookups, ordered iteration and top-k through bisect """
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+
+class SortedIndex:
+    """ keys ordered by (value of attr, key), with their objects """
+
+    def __init__(self, attr):
+        """ empty index over the attribute attr """
+        self.attr = attr
+        self.values = []
+        self.keys = []
+        self.objs = []
+        self.indexed = {}
+
+    def __len__(self):
+        """ return the number of objects indexed """
+        return len(self.keys)
+
+    def value(self, obj):
+        """ return the value of attr of obj, None if not a number """
+        value = getattr(obj, self.attr, None)
+        if type(value) is bool or not isinstance(value, (int, float)):
+            return None
+        return value
+
+    def build(self, objs):
+        """ index every (key, object) of objs at once """
+        entries = sorted((value, key, obj) for key, obj in objs
+                         for value in (self.value(obj),)
+                         if value is not None)
+        self.values = [entry[0] for entry in entries]
+        self.keys = [entry[1] for entry in entries]
+        self.objs = [entry[2] for entry in entries]
+        self.indexed = dict(zip(self.keys, self.values))
+
+    def __position(self, value, key):
+        """ return where (value, key) is or would be """
+        lo = bisect_left(self.values, value)
+        hi = bisect_right(self.values, value, lo)
+        return bisect_left(self.keys, key, lo, hi)
+
+    def add(self, key, obj):
+        """ file obj under its value, moving it if it was filed """
+        self.remove(key)
+        value = self.value(obj)
+        if value is None:
+            return
+        pos = self.__position(value, key)
+        self.values.insert(pos, value)
+        self.keys.insert(pos, key)
+        self.objs.insert(pos, obj)
+        self.indexed[key] = value
+
+    def remove(self, key):
+        """ drop key from the index """
+        value = self.indexed.pop(key, None)
+        if value is not None:
+            pos = self.__position(value, key)
+            del self.values[pos], self.keys[pos], self.objs[pos]
+
+    def range(self, low=None, high=None, low_open=False, high_open=False,
+              reverse=False):
+        """ yield the objects with low <= value <= high in order,
+            either bound left out with None or excluded with *_open """
+        lo, hi = 0, len(self.values)
+        if low is not None:
+            lo = (bisect_right if low_open else bisect_left)(self.values, low)
+        if high is not None:
+            hi = (bisect_left if high_open else bisect_right)(
+                self.values, high, lo)
+        rows = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+        yield from map(self.objs.__getitem__, rows)
+
+    def top(self, k, reverse=False):
+        """ return the k objects with the smallest values, or the
+            largest with reverse """
+        return list(islice(self.range(reverse=reverse), k))
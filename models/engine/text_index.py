@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+""" class TextIndex
+    inverted index over the text_fields of objects, ranked with BM25 """
+import heapq
+import json
+import os
+import re
+from math import log
+
+
+def tokenize(text):
+    """ return the lowercase words of text """
+    return re.findall(r'\w+', text.lower()) if isinstance(text, str) else []
+
+
+class TextIndex:
+    """ postings {term: {key: term frequency}} and the number of words
+        of each key, with the terms of each key so a changed object can
+        be refiled, rebuilt from the postings when read back """
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        """ empty index """
+        self.__docs = {}
+        self.lengths = {}
+        self.postings = {}
+        self.total = 0
+        self.stamp = None
+
+    def __len__(self):
+        """ return the number of objects indexed """
+        return len(self.lengths)
+
+    @property
+    def docs(self):
+        """ return {key: {term: frequency}} """
+        if self.__docs is None:
+            self.__docs = {key: {} for key in self.lengths}
+            for term, posting in self.postings.items():
+                for key, count in posting.items():
+                    self.__docs[key][term] = count
+        return self.__docs
+
+    def add(self, key, obj):
+        """ index the text_fields of obj under key, replacing what was
+            indexed for key before """
+        self.remove(key)
+        terms = {}
+        for field in getattr(obj, 'text_fields', ()):
+            for term in tokenize(getattr(obj, field, None)):
+                terms[term] = terms.get(term, 0) + 1
+        if terms:
+            self.__file(key, terms)
+
+    def __file(self, key, terms):
+        """ add the {term: frequency} of key to the postings """
+        self.docs[key] = terms
+        length = sum(terms.values())
+        self.lengths[key] = length
+        self.total += length
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[key] = count
+
+    def remove(self, key):
+        """ drop key from the index """
+        if key not in self.lengths:
+            return
+        terms = self.docs.pop(key)
+        self.total -= self.lengths.pop(key)
+        for term in terms:
+            posting = self.postings[term]
+            del posting[key]
+            if not posting:
+                del self.postings[term]
+
+    def search(self, text, names=None, limit=10):
+        """ return the keys best matching the words of text, of the
+            classes names only if given, best first """
+        if not self.lengths:
+            return []
+        count = len(self.lengths)
+        average = self.total / count
+        scores = {}
+        for term in set(tokenize(text)):
+            posting = self.postings.get(term, {})
+            idf = log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for key, freq in posting.items():
+                norm = self.k1 * (1 - self.b + self.b *
+                                  self.lengths[key] / average)
+                scores[key] = (scores.get(key, 0) +
+                               idf * freq * (self.k1 + 1) / (freq + norm))
+        if names is not None:
+            scores = {key: score for key, score in scores.items()
+                      if key.split('.', 1)[0] in names}
+        return [key for score, key in heapq.nlargest(
+            limit, ((score, key) for key, score in scores.items()))]
+
+    def dump(self, path, stamp):
+        """ write the index to path, tagged with stamp """
+        tmp = path + '.tmp'
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(tmp, 'w', encoding='utf-8') as fname:
+            fname.write(json.dumps({'stamp': stamp, 'lengths': self.lengths,
+                                    'postings': self.postings}))
+        os.replace(tmp, path)
+        self.stamp = stamp
+
+    @classmethod
+    def load(cls, path, stamp):
+        """ return the index written to path, None unless it was
+            written with this stamp """
+        try:
+            with open(path, 'r', encoding='utf-8') as fname:
+                saved = json.load(fname)
+        except (OSError, ValueError):
+            return None
+        if saved.get('stamp') != stamp:
+            return None
+        index = cls()
+        index.lengths = saved['lengths']
+        index.postings = saved['postings']
+        index.total = sum(index.lengths.values())
+        index.__docs = None
+        index.stamp = stamp
+        return index
@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+""" class View
+    an aggregate over the objects of a class, per value of an attribute,
+    kept up to date by applying the change of each object added or
+    removed rather than by recounting """
+from bisect import bisect_left, insort
+
+
+aggregates = ('count', 'sum', 'mean', 'min', 'max')
+
+
+class View:
+    """ {group: [count, total, sorted values]} with the (group, value)
+        filed for each key, so a changed object can be refiled """
+
+    def __init__(self, cls, by=None, agg='count', attr=None):
+        """ agg (count, sum, mean, min or max) of attr over the objects
+            of the class name cls per value of by, over all of them
+            without by, count without attr counting the objects """
+        if agg not in aggregates:
+            raise ValueError('{} is not an aggregate'.format(agg))
+        if attr is None and agg != 'count':
+            raise ValueError('{} needs an attribute'.format(agg))
+        self.cls = cls
+        self.by = by
+        self.agg = agg
+        self.attr = attr
+        self.groups = {}
+        self.filed = {}
+        self.stale = False
+
+    def __len__(self):
+        """ return the number of objects counted """
+        return len(self.filed)
+
+    def value(self, obj):
+        """ return the value of attr of obj, None if not a number, 1
+            without attr """
+        if self.attr is None:
+            return 1
+        value = getattr(obj, self.attr, None)
+        if type(value) is bool or not isinstance(value, (int, float)):
+            return None
+        return value
+
+    def add(self, key, obj):
+        """ count obj, moving it if it was counted """
+        self.remove(key)
+        value = self.value(obj)
+        if value is None:
+            return
+        group = getattr(obj, self.by, None) if self.by else None
+        try:
+            state = self.groups.setdefault(group, [0, 0, []])
+        except TypeError:
+            return
+        state[0] += 1
+        state[1] += value
+        if self.agg in ('min', 'max'):
+            insort(state[2], value)
+        self.filed[key] = (group, value)
+
+    def remove(self, key):
+        """ stop counting key """
+        group, value = self.filed.pop(key, (None, None))
+        if value is None:
+            return
+        state = self.groups[group]
+        state[0] -= 1
+        state[1] -= value
+        if self.agg in ('min', 'max'):
+            del state[2][bisect_left(state[2], value)]
+        if not state[0]:
+            del self.groups[group]
+
+    def clear(self):
+        """ forget every object, to be counted again """
+        self.groups = {}
+        self.filed = {}
+
+    def get(self, group=None):
+        """ return the aggregate of group, 0 for an empty count or sum,
+            None for an empty mean, min or max """
+        state = self.groups.get(group)
+        if state is None:
+            return 0 if self.agg in ('count', 'sum') else None
+        if self.agg == 'count':
+            return state[0]
+        if self.agg == 'sum':
+            return state[1]
+        if self.agg == 'mean':
+            return state[1] / state[0]
+        return state[2][0] if self.agg == 'min' else state[2][-1]
+
+    def results(self):
+        """ return {group: aggregate} of every group """
+        return {group: self.get(group) for group in self.groups}
@@ -1,11 +1,23 @@
 #!/usr/bin/python3
 """ Class Place """
 
+import gc
+import models
 from models.base_model import BaseModel
+from models.engine.columns import Column, ColumnStore
 
 
 class Place(BaseModel):
     """ Place class that inherits BaseModel """
+    __slots__ = ('__row',)
+    foreign_keys = ('city_id', 'user_id')
+    range_keys = ('price_by_night', 'max_guest', 'number_rooms')
+    text_fields = ('name', 'description')
+    bitmap_keys = ('amenity_ids',)
+    numeric = {'number_rooms': 'q', 'number_bathrooms': 'q',
+               'max_guest': 'q', 'price_by_night': 'q',
+               'latitude': 'd', 'longitude': 'd'}
+    columns = None
     city_id = ""
     user_id = ""
     name = ""
@@ -17,3 +29,94 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    @classmethod
+    def use_columns(cls, enable=True):
+        """ keep the numeric fields of the places in the typed columns
+            of Place.columns, or back in each instance with
+            enable=False; the places alive are moved over
+            TypeError, ValueError or OverflowError if one holds a value
+            a column cannot hold, the columns being left off """
+        places = [obj for obj in gc.get_objects() if isinstance(obj, cls)]
+        if cls.columns is not None:
+            for place in places:
+                values = cls.columns.values(place)
+                object.__setattr__(place, '_Place__row', None)
+                place.__dict__.update(values)
+            for name in cls.numeric:
+                setattr(cls, name, getattr(cls, name))
+            cls.columns = None
+        if enable:
+            columns = ColumnStore(cls.numeric, '_Place__row')
+            try:
+                for place in places:
+                    for name in cls.numeric:
+                        if name in place.__dict__:
+                            columns.set(place, name, place.__dict__[name])
+            except (TypeError, ValueError, OverflowError):
+                for place in places:
+                    object.__setattr__(place, '_Place__row', None)
+                raise
+            for place in places:
+                for name in cls.numeric:
+                    place.__dict__.pop(name, None)
+            cls.columns = columns
+            for name in cls.numeric:
+                setattr(cls, name, Column(columns, name))
+        for place in places:
+            object.__setattr__(place, '_BaseModel__cache', None)
+
+    def __init__(self, *args, **kwargs):
+        """ Construct """
+        super().__init__(*args, **kwargs)
+        if self.columns is not None:
+            self.columns.claim(self)
+
+    def __del__(self):
+        """ give the row back to the columns """
+        if Place.columns is not None:
+            Place.columns.release(self)
+
+    @classmethod
+    def filter(cls, **conditions):
+        """ yield the stored places matching the conditions of
+            Place.columns.rows(), e.g. max_guest__gte=4, each looked up
+            in storage as it is reached; a row is only taken from the
+            place storage holds, not from a stale copy with the same
+            id, e.g. one held across a reload """
+        objs = models.storage.all(cls)
+        rows = cls.columns.rows(**conditions)
+        keys = map((cls.__name__ + '.').__add__,
+                   map(cls.columns.owners.__getitem__, rows))
+        for obj, row in zip(map(objs.get, keys), rows):
+            if getattr(obj, '_Place__row', None) == row:
+                yield obj
+
+    @classmethod
+    def from_dict(cls, record):
+        """ build an instance from a to_dict() record in one go """
+        if cls.columns is None:
+            return super().from_dict(record)
+        obj = super().from_dict({key: val for key, val in record.items()
+                                 if key not in cls.numeric})
+        for name in cls.numeric:
+            if name in record:
+                cls.columns.set(obj, name, record[name])
+        return obj
+
+    def __str__(self):
+        """ String, cached until an attribute changes, unless one
+            holds a list or dict """
+        if self.columns is None:
+            return super().__str__()
+        return self.cached('str', lambda: '[' + type(self).__name__ +
+                           '] (' + str(self.id) + ') ' +
+                           str(dict(self.__dict__,
+                                    **self.columns.values(self))))
+
+    def to_dict(self):
+        """ Return a dictonary """
+        aux_dict = super().to_dict()
+        if self.columns is not None:
+            aux_dict.update(self.columns.values(self))
+        return aux_dict
@@ -5,6 +5,8 @@ from models.base_model import BaseModel
 
 class Review(BaseModel):
     """ Review class that inherits BaseModel """
+    foreign_keys = ('place_id', 'user_id')
+    text_fields = ('text',)
     place_id = ""
     user_id = ""
     text = ""
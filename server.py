@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+""" HBNB server
+    serves the console commands to any number of clients over a Unix
+    or TCP socket, all of them sharing one storage held in memory once:
+    the commands run one at a time on a single thread, in the order
+    they arrive, so that no two writes interleave, and each connection
+    gets the replies of the commands it sent, pipelined or not, in order
+    a command is a line, its reply the length in bytes of what it
+    printed on a line, then what it printed; quit or EOF ends the
+    connection
+    clients are not authenticated and import/export reach the files of
+    the server, so it only listens on a Unix socket or a loopback
+    address
+
+    usage: ./server.py ADDRESS, then ./client.py ADDRESS
+    ADDRESS: unix:PATH, HOST:PORT or PORT (on 127.0.0.1) """
+import argparse
+import asyncio
+import ipaddress
+import os
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from client import frame, parse
+from console import HBNBCommand
+from models import storage
+
+
+class HBNBServer:
+    """ one console whose commands run on a single worker thread """
+
+    limit = 1 << 20
+
+    def __init__(self, console=None):
+        """ serve console, by default a new HBNBCommand """
+        self.console = HBNBCommand() if console is None else console
+        self.executor = ThreadPoolExecutor(1)
+        self.server = None
+        self.path = None
+        self.writers = set()
+
+    async def call(self, func, *args):
+        """ return func(*args), run on the worker thread """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    @staticmethod
+    def loopback(host):
+        """ whether host only reaches this machine """
+        if host == 'localhost':
+            return True
+        try:
+            return ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            return False
+
+    async def start(self, address):
+        """ load the storage, then listen on address; raise ValueError
+            if it is a TCP address other than loopback """
+        kwargs = parse(address)
+        if 'path' not in kwargs and not self.loopback(kwargs['host']):
+            raise ValueError('{} is not a loopback address'.format(
+                kwargs['host']))
+        await self.call(storage.count)
+        if 'path' in kwargs:
+            self.path = kwargs['path']
+            self.server = await asyncio.start_unix_server(
+                self.handle, limit=self.limit, **kwargs)
+        else:
+            self.server = await asyncio.start_server(
+                self.handle, limit=self.limit, **kwargs)
+        return self.server
+
+    async def handle(self, reader, writer):
+        """ reply to each command of the connection until it ends or
+            sends quit or EOF """
+        self.writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                output, stop = await self.call(
+                    self.console.run,
+                    line.decode('utf-8', 'replace').strip())
+                writer.write(frame(output))
+                await writer.drain()
+                if stop:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def close(self):
+        """ stop listening and end the connections, then write what
+            storage has pending once the commands running are done """
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self.writers):
+                writer.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+        await self.call(storage.close)
+        self.executor.shutdown()
+
+
+async def serve(address):
+    """ serve address until SIGINT or SIGTERM """
+    hbnb = HBNBServer()
+    try:
+        await hbnb.start(address)
+    except ValueError as error:
+        hbnb.executor.shutdown()
+        sys.exit('server.py: {}'.format(error))
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    print('serving on {}'.format(address), file=sys.stderr)
+    try:
+        await stop.wait()
+    finally:
+        await hbnb.close()
+
+
+def main():
+    """ parse the address and serve it """
+    parser = argparse.ArgumentParser(description='HBNB server')
+    parser.add_argument('address', help='unix:PATH, HOST:PORT or PORT')
+    options = parser.parse_args()
+    asyncio.run(serve(options.address))
+
+
+if __name__ == '__main__':
+    main()
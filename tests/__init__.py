@@ -0,0 +1,26 @@
+#!/usr/bin/python3
+""" tests of the console and the models
+    the storage files a run leaves in the working directory, the
+    <file>.text index being written by storage at exit, are removed
+    once storage is closed, unless they were there before the run """
+import atexit
+import os
+import shutil
+
+artifacts = ('file.json', 'file.json.log', 'file.json.text', 'file.bin',
+             'file.bin.text', 'storage', 'hbnb.db', 'hbnb.db.text')
+existing = {name for name in artifacts if os.path.lexists(name)}
+
+
+def clean():
+    """ remove the artifacts created by the run """
+    for name in artifacts:
+        if name in existing or not os.path.lexists(name):
+            continue
+        if os.path.isdir(name):
+            shutil.rmtree(name, ignore_errors=True)
+        else:
+            os.remove(name)
+
+
+atexit.register(clean)
@@ -1,10 +1,15 @@
 #!/usr/bin/python3
 """Unittests for console.py"""
+import csv
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 from io import StringIO
 from console import HBNBCommand
 from models import storage
+from models.engine import frame
 from models.base_model import BaseModel
 from models.user import User
 
@@ -146,6 +151,270 @@ class TestHBNBCommand(unittest.TestCase):
             self.console.onecmd("all User")
             self.assertIn(new_id, f.getvalue())
 
+    def test_all_pages(self):
+        """Test all streams pages and JSON lines"""
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create Amenity")
+            self.console.onecmd("create Amenity")
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("Amenity.all(limit=1)")
+            first = eval(f.getvalue())
+            self.assertEqual(len(first), 1)
+        first_id = first[0].split()[1][1:-1]
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd(f'all Amenity after="{first_id}" '
+                                'format=jsonl')
+            lines = f.getvalue().splitlines()
+            self.assertNotIn(first_id, f.getvalue())
+            self.assertTrue(all(json.loads(line)["__class__"] == "Amenity"
+                                for line in lines))
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("all limit=2")
+            self.console.onecmd("all limit=1 offset=1")
+            two, second = f.getvalue().splitlines()
+            self.assertEqual(eval(second), eval(two)[1:])
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("all Amenity limit=-1")
+            self.assertEqual(f.getvalue().strip(), "** invalid options **")
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("all Place after=nope")
+            self.assertEqual(f.getvalue().strip(), "** no instance found **")
+
+    def test_where(self):
+        """Test where prints the matching instances"""
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create User")
+            new_id = f.getvalue().strip()
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd(f'User.where(id="{new_id}", limit=1)')
+            self.assertIn(new_id, f.getvalue())
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd('where User id__gt=')
+            self.assertEqual(f.getvalue().strip(), "** invalid query **")
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd('Place.where(city_id=[1])')
+            self.assertEqual(f.getvalue().strip(), "[]")
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd('where Place price_by_night__gte="abc"')
+            self.assertEqual(f.getvalue().strip(), "[]")
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create User")
+            self.console.onecmd("create User")
+            first, second = f.getvalue().split()
+            self.console.onecmd(f"update User {first} rank 1")
+            self.console.onecmd(f'update User {second} rank "top"')
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd('where User order="rank"')
+            self.assertEqual(f.getvalue().strip(), "** invalid query **")
+
+    def test_geo(self):
+        """Test geo finds places around a point"""
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create Place")
+            new_id = f.getvalue().strip()
+            self.console.onecmd(f"update Place {new_id} latitude 6.5")
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("geo radius 6.5 0 1")
+            self.assertIn(new_id, f.getvalue())
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("geo nearest 6.5")
+            self.assertEqual(f.getvalue().strip(), "** invalid coordinates **")
+        for count in ('-1', '1.5'):
+            with patch('sys.stdout', new=StringIO()) as f:
+                self.console.onecmd(f"geo nearest 6.5 0 {count}")
+                self.assertEqual(f.getvalue().strip(),
+                                 "** invalid coordinates **")
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("geo nearest 6.5 0 1")
+            self.assertIn(new_id, f.getvalue())
+            self.console.onecmd(f"destroy Place {new_id}")
+
+    def test_search(self):
+        """Test search ranks places and reviews by their text"""
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create Place")
+            new_id = f.getvalue().strip()
+            self.console.onecmd(f'update Place {new_id} name "Quokka"')
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("search Place quokka")
+            self.assertIn(new_id, f.getvalue())
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("search Review quokka")
+            self.assertEqual(f.getvalue().strip(), "[]")
+            self.console.onecmd(f"destroy Place {new_id}")
+            self.console.onecmd("search quokka")
+            self.assertNotIn(new_id, f.getvalue())
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("search")
+            self.assertEqual(f.getvalue().strip(), "** words missing **")
+
+    @unittest.skipIf(frame.numpy is None, 'NumPy is not installed')
+    def test_stats(self):
+        """Test stats aggregates per group"""
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create Place")
+            new_id = f.getvalue().strip()
+            self.console.onecmd(f'update Place {new_id} city_id "c-stats"')
+            self.console.onecmd(f"update Place {new_id} max_guest 7")
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("stats Place max max_guest by city_id")
+            self.assertIn("'c-stats': 7", f.getvalue())
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("stats Place max by city_id")
+            self.assertEqual(f.getvalue().strip(), "** invalid stats **")
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create City")
+            self.console.onecmd("create Review")
+            city_id, review_id = f.getvalue().split()
+            self.console.onecmd(f'update City {city_id} state_id "s-stats"')
+            self.console.onecmd(f'update Place {new_id} city_id "{city_id}"')
+            self.console.onecmd(f'update Review {review_id} place_id '
+                                f'"{new_id}"')
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("stats Review count by "
+                                "place_id.city_id.state_id")
+            self.assertIn("'s-stats': 1", f.getvalue())
+            self.console.onecmd(f"destroy Review {review_id}")
+            self.console.onecmd(f"destroy City {city_id}")
+            self.console.onecmd(f"destroy Place {new_id}")
+
+    def test_count_by(self):
+        """Test count per attribute follows update and destroy"""
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create Place")
+            new_id = f.getvalue().strip()
+            self.console.onecmd(f'update Place {new_id} city_id "c-count"')
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("count Place by city_id")
+            self.assertIn("'c-count': 1", f.getvalue())
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd(f'update Place {new_id} city_id "c-moved"')
+            self.console.onecmd("count Place by city_id")
+            self.assertNotIn("'c-count'", f.getvalue())
+            self.assertIn("'c-moved': 1", f.getvalue())
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd(f"destroy Place {new_id}")
+            self.console.onecmd("count Place by city_id")
+            self.assertNotIn("'c-moved'", f.getvalue())
+
+    def test_update_indexed_list(self):
+        """Test a foreign key set to a list once it is indexed"""
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create Place")
+            new_id = f.getvalue().strip()
+            self.console.onecmd('Place.where(city_id="c-list")')
+            self.console.onecmd(f"update Place {new_id} city_id [1]")
+        self.assertEqual(storage.get("Place", new_id).city_id, [1])
+        self.console.onecmd(f"destroy Place {new_id}")
+
+    def test_count_by_attribute(self):
+        """Test count by a plain attribute keeps no view"""
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create User")
+            new_id = f.getvalue().strip()
+            self.console.onecmd(f'update User {new_id} first_name "Ada"')
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("count User by first_name")
+            self.assertIn("'Ada': 1", f.getvalue())
+        with self.assertRaises(KeyError):
+            storage.view('User.count.first_name')
+
+    def test_run_batch(self):
+        """Test a batch script saves once and reports failing lines"""
+        script = ["create State", "# comment", "", "show State nope",
+                  "count State", "quit", "create State"]
+        errors = StringIO()
+        with patch('sys.stdout', new=StringIO()) as f:
+            count, failed = self.console.run_batch(script, errors=errors)
+        self.assertEqual((count, failed), (4, 1))
+        self.assertIn("line 4: show State nope: ** no instance found **",
+                      errors.getvalue())
+        self.assertIn("4 commands, 1 errors", errors.getvalue())
+        self.assertEqual(len(f.getvalue().splitlines()), 3)
+        with patch('sys.stdout', new=StringIO()), \
+                patch.object(storage, 'flush',
+                             wraps=storage.flush) as flush:
+            self.console.run_batch(["count State"] * 4, 2, StringIO())
+        self.assertEqual(flush.call_count, 3)
+
+    def test_import(self):
+        """Test import creates instances from JSON lines, keeping ids"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'states.jsonl')
+        with open(path, 'w') as fname:
+            fname.write('{"id": "imp-1", "name": "Lagos"}\n'
+                        '\n'
+                        '{"name": "Oyo", "created_at": "2020-01-01T00:00:00",'
+                        ' "updated_at": "2020-01-01T00:00:00"}\n'
+                        'not json\n'
+                        '{"__class__": "User", "id": "imp-2"}\n')
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd(f"import State {path}")
+            self.assertEqual(f.getvalue().split("\n")[-2], "2")
+            self.assertIn("** invalid line 4 **", f.getvalue())
+            self.assertIn("** invalid line 5 **", f.getvalue())
+        self.assertEqual(storage.get("State", "imp-1").name, "Lagos")
+        self.assertIsNone(storage.get("User", "imp-2"))
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("import State nope.jsonl")
+            self.assertEqual(f.getvalue().strip(), "** file doesn't exist **")
+            self.console.onecmd("destroy State imp-1")
+
+    def test_export(self):
+        """Test export writes every instance as JSON lines or CSV"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        directory = tmp.name
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create Review")
+            new_id = f.getvalue().strip()
+            self.console.onecmd(f'update Review {new_id} text "Great"')
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd(f"export Review jsonl {directory}/r.jsonl")
+            self.assertEqual(int(f.getvalue()), storage.count("Review"))
+        with open(os.path.join(directory, "r.jsonl")) as fname:
+            records = [json.loads(line) for line in fname]
+        self.assertIn(new_id, [record["id"] for record in records])
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd(f"export Review csv {directory}/r.csv")
+        with open(os.path.join(directory, "r.csv")) as fname:
+            rows = list(csv.DictReader(fname))
+        self.assertIn({"id": new_id, "text": "Great"},
+                      [{"id": row["id"], "text": row["text"]}
+                       for row in rows])
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create Place")
+            place_id = f.getvalue().strip()
+            self.console.onecmd(f"export Place csv {directory}/p.csv")
+            self.console.onecmd(f"destroy Place {place_id}")
+        with open(os.path.join(directory, "p.csv")) as fname:
+            rows = [row for row in csv.DictReader(fname)
+                    if row["id"] == place_id]
+        self.assertEqual((rows[0]["max_guest"], rows[0]["amenity_ids"]),
+                         ("0", "[]"))
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("export Review xml out.xml")
+            self.assertEqual(f.getvalue().strip(),
+                             "** format doesn't exist **")
+            self.console.onecmd(f"destroy Review {new_id}")
+
+    def test_count_valid_class(self):
+        """Test count command follows create and destroy"""
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("User.count()")
+            before = int(f.getvalue())
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create User")
+            new_id = f.getvalue().strip()
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("count User")
+            self.assertEqual(int(f.getvalue()), before + 1)
+            self.console.onecmd(f"destroy User {new_id}")
+            self.console.onecmd("count User")
+            self.assertEqual(f.getvalue().split(), [str(before + 1),
+                                                    str(before)])
+
     def test_update_missing_class(self):
         """Test update command with no class name"""
         with patch('sys.stdout', new=StringIO()) as f:
@@ -189,6 +458,18 @@ class TestHBNBCommand(unittest.TestCase):
             self.assertEqual(obj.age, 30)
             self.assertEqual(obj.city, 'Lagos')
 
+    def test_update_not_evaluated(self):
+        """Test update stores a Python expression as text, not its value"""
+        with patch('sys.stdout', new=StringIO()) as f:
+            self.console.onecmd("create User")
+            new_id = f.getvalue().strip()
+            self.console.onecmd(
+                f"update User {new_id} name __import__('os').getcwd()")
+            self.console.onecmd(f"update User {new_id} age 30")
+            obj = storage.all()[f"User.{new_id}"]
+            self.assertEqual(obj.name, "__import__('os').getcwd()")
+            self.assertEqual(obj.age, 30)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,7 @@
 """ testing files """
 import unittest
 import inspect
+import json
 import pep8
 from models.base_model import BaseModel
 from datetime import datetime
@@ -107,3 +108,58 @@ class test_for_base_model(unittest.TestCase):
         """check class """
         ml = BaseModel()
         self.assertTrue(ml, BaseModel)
+
+    def test_from_dict(self):
+        """ check from_dict rebuilds the object of to_dict """
+        object_test = BaseModel(score=300)
+        copy = BaseModel.from_dict(object_test.to_dict())
+        self.assertIsInstance(copy, BaseModel)
+        self.assertEqual(copy.__dict__, object_test.__dict__)
+        self.assertNotIn('__class__', copy.__dict__)
+
+    def test_from_dict_partial(self):
+        """ check from_dict fills in what the record lacks """
+        copy = BaseModel.from_dict({'__class__': 'BaseModel', 'score': 1})
+        self.assertTrue(hasattr(copy, 'id'))
+        self.assertEqual(type(copy.created_at), datetime)
+        self.assertEqual(copy.score, 1)
+
+    def test_to_json(self):
+        """ check to_json is cached until an attribute changes """
+        object_test = BaseModel()
+        fragment = object_test.to_json()
+        self.assertEqual(json.loads(fragment), object_test.to_dict())
+        self.assertIs(object_test.to_json(), fragment)
+        object_test.score = 5
+        self.assertEqual(json.loads(object_test.to_json())['score'], 5)
+        del object_test.score
+        self.assertNotIn('score', json.loads(object_test.to_json()))
+        self.assertNotIn('_BaseModel__cache', object_test.to_dict())
+
+    def test_cached(self):
+        """ check str and to_dict are cached until a change or save """
+        object_test = BaseModel()
+        text = str(object_test)
+        hits = BaseModel.cache_info()['hits']
+        self.assertIs(str(object_test), text)
+        self.assertEqual(BaseModel.cache_info()['hits'], hits + 1)
+        record = object_test.to_dict()
+        record['score'] = 5
+        self.assertNotIn('score', object_test.to_dict())
+        object_test.score = 5
+        self.assertIn("'score': 5", str(object_test))
+        self.assertEqual(object_test.to_dict()['score'], 5)
+        before = object_test.to_dict()['updated_at']
+        object_test.save()
+        self.assertNotEqual(object_test.to_dict()['updated_at'], before)
+        self.assertTrue(0 < BaseModel.cache_info()['rate'] < 1)
+
+    def test_cached_mutable(self):
+        """ check str and to_json follow a list changed in place """
+        object_test = BaseModel()
+        object_test.tags = ['a']
+        self.assertIn("'tags': ['a']", str(object_test))
+        object_test.tags.append('b')
+        self.assertIn("'tags': ['a', 'b']", str(object_test))
+        self.assertEqual(json.loads(object_test.to_json())['tags'],
+                         object_test.to_dict()['tags'])
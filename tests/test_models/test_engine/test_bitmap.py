@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+""" Check BitmapIndex class """
+import unittest
+from models import storage
+from models.place import Place
+from models.engine import bitmap
+from models.engine.bitmap import BitmapIndex
+
+
+class test_bitmap(unittest.TestCase):
+    """ check the amenity bitmaps """
+
+    def setUp(self):
+        """ places with wifi, pool and parking in various mixes """
+        mixes = [['wifi', 'pool', 'parking'], ['wifi', 'pool'],
+                 ['wifi'], [], ['pool', 'parking', 'pool']]
+        self.places = [Place(amenity_ids=mix) for mix in mixes]
+        self.index = BitmapIndex('amenity_ids')
+        for i, place in enumerate(self.places):
+            self.index.add(str(i), place)
+
+    def test_select(self):
+        """ AND, OR and NOT of amenities """
+        p = self.places
+        self.assertEqual(self.index.select(all_of=('wifi', 'pool')),
+                         [p[0], p[1]])
+        self.assertEqual(self.index.select(any_of=('parking', 'spa')),
+                         [p[0], p[4]])
+        self.assertEqual(self.index.select(none_of=('wifi',)), [p[3], p[4]])
+        self.assertEqual(self.index.select(all_of=('pool',),
+                                           none_of=('parking',)), [p[1]])
+        self.assertEqual(self.index.select(all_of=('spa',)), [])
+        self.assertEqual(self.index.count(), 5)
+
+    def test_select_without_numpy(self):
+        """ the same rows without NumPy """
+        numpy, bitmap.numpy = bitmap.numpy, None
+        try:
+            self.assertEqual(self.index.select(any_of=('pool',)),
+                             [self.places[0], self.places[1],
+                              self.places[4]])
+        finally:
+            bitmap.numpy = numpy
+
+    def test_facets(self):
+        """ counts per amenity, overall or among the matches """
+        self.assertEqual(self.index.facets(),
+                         {'wifi': 3, 'pool': 3, 'parking': 2})
+        self.assertEqual(self.index.facets(all_of=('wifi',)),
+                         {'wifi': 3, 'pool': 2, 'parking': 1})
+
+    def test_update(self):
+        """ changed amenities are refiled, rows of removed places reused """
+        self.places[2].amenity_ids = ['parking']
+        self.index.add('2', self.places[2])
+        self.assertEqual(self.index.facets()['wifi'], 2)
+        self.assertEqual(self.index.count(all_of=('parking',)), 3)
+        self.index.remove('0')
+        self.index.remove('0')
+        self.assertEqual(self.index.count(all_of=('parking',)), 2)
+        self.index.add('5', Place(amenity_ids=['spa']))
+        self.assertEqual(self.index.rows['5'], 0)
+        self.assertEqual(self.index.facets(none_of=('spa',)),
+                         {'wifi': 1, 'pool': 2, 'parking': 2})
+
+    def test_storage(self):
+        """ the storage index follows save and destroy """
+        index = storage.bitmap(Place, 'amenity_ids')
+        place = self.places[0]
+        storage.new(place)
+        self.assertIn(place, index.select(all_of=('wifi', 'parking')))
+        place.amenity_ids = ['spa']
+        place.save()
+        self.assertEqual(index.select(all_of=('spa',)), [place])
+        storage.delete(place)
+        storage.save()
+        self.assertEqual(index.select(all_of=('spa',)), [])
+        with self.assertRaises(ValueError):
+            storage.bitmap(Place, 'name')
@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+""" Check ColumnStore class """
+import gc
+import unittest
+from models import storage
+from models.engine import columns
+from models.place import Place
+
+
+class test_columns(unittest.TestCase):
+    """ check the columnar Place fields """
+
+    def setUp(self):
+        """ fresh columns """
+        Place.use_columns()
+
+    def tearDown(self):
+        """ numeric fields back in each instance """
+        for place in list(storage.all(Place).values()):
+            storage.delete(place)
+        Place.use_columns(False)
+
+    def test_view(self):
+        """ numeric fields live in the columns, not in __dict__ """
+        place = Place(max_guest=4, latitude=6.5)
+        place.price_by_night = 120
+        self.assertEqual((place.max_guest, place.price_by_night), (4, 120))
+        self.assertEqual((place.latitude, place.number_rooms), (6.5, 0))
+        self.assertNotIn('max_guest', place.__dict__)
+        self.assertEqual(
+            Place.columns.columns['max_guest'][place._Place__row], 4)
+        self.assertEqual(place.to_dict()['price_by_night'], 120)
+        self.assertIn("'max_guest': 4", str(place))
+        with self.assertRaises(TypeError):
+            place.max_guest = 'many'
+
+    def test_from_dict(self):
+        """ hydrated records keep their numbers in the columns """
+        record = Place(max_guest=3).to_dict()
+        place = Place.from_dict(record)
+        self.assertEqual(place.max_guest, 3)
+        self.assertNotIn('max_guest', place.__dict__)
+        self.assertEqual(place.to_dict(), record)
+
+    def test_filter(self):
+        """ conditions are combined over the columns """
+        places = [Place(max_guest=i, price_by_night=10 * i)
+                  for i in range(10)]
+        self.assertLessEqual({place._Place__row for place in places[:2]},
+                             set(Place.columns.rows(max_guest__lt=2)))
+        for place in places:
+            storage.new(place)
+        self.assertEqual(list(Place.filter(max_guest__gte=4,
+                                           price_by_night__lt=70)),
+                         places[4:7])
+        self.assertEqual(list(Place.filter(max_guest=2)), [places[2]])
+        with self.assertRaises(ValueError):
+            list(Place.filter(name='x'))
+
+    def test_stale_copy(self):
+        """ a copy with the id of a stored place is not found """
+        place = Place(max_guest=5)
+        copy = Place.from_dict(place.to_dict())
+        storage.new(copy)
+        self.assertEqual(list(Place.filter(max_guest=5)), [copy])
+        copy.max_guest = 3
+        self.assertEqual(list(Place.filter(max_guest=5)), [])
+        self.assertEqual(place.max_guest, 5)
+
+    def test_switch(self):
+        """ places alive keep their numbers both ways """
+        place = Place(max_guest=7)
+        storage.new(place)
+        Place.use_columns(False)
+        self.assertEqual(place.max_guest, 7)
+        self.assertEqual(place.to_dict()['max_guest'], 7)
+        Place.use_columns()
+        self.assertEqual(place.max_guest, 7)
+        self.assertNotIn('max_guest', place.__dict__)
+        self.assertEqual(list(Place.filter(max_guest=7)), [place])
+        Place.use_columns(False)
+        place.max_guest = 'many'
+        with self.assertRaises(TypeError):
+            Place.use_columns()
+        self.assertIsNone(Place.columns)
+        self.assertEqual(place.max_guest, 'many')
+
+    def test_free_rows(self):
+        """ rows of collected places are reused """
+        gc.collect()
+        place = Place(max_guest=1)
+        row, used = place._Place__row, len(Place.columns)
+        del place
+        gc.collect()
+        self.assertEqual(len(Place.columns), used - 1)
+        self.assertNotIn(row, Place.columns.rows())
+        owners = len(Place.columns.owners)
+        place = Place()
+        place.max_guest = 2
+        self.assertEqual(len(Place.columns.owners), owners)
+        storage.new(place)
+        self.assertEqual(list(Place.filter(max_guest=2)), [place])
+        storage.delete(place)
+
+    def test_filter_without_numpy(self):
+        """ the array scan finds the same rows as NumPy """
+        used = len(Place.columns)
+        places = [Place(max_guest=i, latitude=i / 2) for i in range(10)]
+        expected = Place.columns.rows(max_guest__ne=3, latitude__lte=2)
+        numpy, columns.numpy = columns.numpy, None
+        try:
+            self.assertEqual(Place.columns.rows(max_guest__ne=3,
+                                                latitude__lte=2), expected)
+        finally:
+            columns.numpy = numpy
+        self.assertLessEqual({places[i]._Place__row for i in (0, 1, 2, 4)},
+                             set(expected))
+        self.assertNotIn(places[3]._Place__row, expected)
+        self.assertEqual(len(Place.columns), used + len(places))
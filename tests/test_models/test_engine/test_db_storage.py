@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+""" Check DBStorage class """
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from models.engine.db_storage import DBStorage
+
+
+class test_db_storage(unittest.TestCase):
+    """ check the SQLite engine """
+
+    def setUp(self):
+        """ database in a temporary directory """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'hbnb.db')
+        self.db = DBStorage(self.path)
+        self.db.reload()
+
+    def tearDown(self):
+        """ remove the database """
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_new_save_reload(self):
+        """ saved rows are read back by a new connection """
+        obj = City(name='Lagos', state_id='s1')
+        self.db.new(obj)
+        self.db.save()
+        other = DBStorage(self.path)
+        other.reload()
+        city = other.get(City, obj.id)
+        self.assertEqual(city.name, 'Lagos')
+        self.assertEqual(city.created_at, obj.created_at)
+        self.assertEqual(other.count(City), 1)
+        other.close()
+
+    def test_save_setattr(self):
+        """ save writes attributes set without new() """
+        obj = City(id='c1', name='Lagos', state_id='s1')
+        self.db.new(obj)
+        with mock.patch('models.storage', self.db):
+            obj.name = 'Abuja'
+            obj.state_id = 's2'
+        self.db.save()
+        other = DBStorage(self.path)
+        other.reload()
+        self.assertEqual(other.get(City, 'c1').name, 'Abuja')
+        self.assertEqual(list(other.by(City, state_id='s2')), ['City.c1'])
+        other.close()
+
+    def test_unbindable_foreign_key(self):
+        """ a foreign key SQLite cannot bind is stored as JSON text """
+        obj = Place(id='p1', city_id=[1])
+        self.db.new(obj)
+        self.db.save()
+        self.assertEqual(list(self.db.by(Place, city_id=[1])), ['Place.p1'])
+        self.assertEqual(self.db.by(Place, city_id='[1]'), {})
+
+    def test_deferred_connect(self):
+        """ the database is opened on the first access """
+        path = os.path.join(self.tmp.name, 'other.db')
+        other = DBStorage(path)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(other.count(City), 0)
+        self.assertTrue(os.path.exists(path))
+        other.close()
+
+    def test_unsaved_rows_rolled_back(self):
+        """ rows are only visible to others after save """
+        self.db.new(User(id='u1'))
+        self.assertEqual(self.db.count(User), 1)
+        self.db.reload()
+        self.assertEqual(self.db.count(User), 0)
+
+    def test_identity(self):
+        """ all and get return the same instance """
+        obj = Place(id='p1', city_id='c1')
+        self.db.new(obj)
+        self.assertIs(self.db.all(Place)['Place.p1'], obj)
+        self.assertIs(self.db.get('Place', 'p1'), obj)
+        self.assertEqual(self.db.all(), {'Place.p1': obj})
+
+    def test_delete(self):
+        """ delete removes the row """
+        obj = Review(id='r1', place_id='p1')
+        self.db.new(obj)
+        self.db.save()
+        self.db.delete(obj)
+        self.db.save()
+        self.assertIsNone(self.db.get(Review, 'r1'))
+        self.assertEqual(self.db.count(), 0)
+
+    def test_batch(self):
+        """ saves inside a batch commit once at the end """
+        with self.db.batch():
+            self.db.new(User(id='u1'))
+            self.db.save()
+            conn = sqlite3.connect(self.path)
+            self.assertEqual(conn.execute(
+                'SELECT COUNT(*) FROM User').fetchone()[0], 0)
+        self.assertEqual(conn.execute(
+            'SELECT COUNT(*) FROM User').fetchone()[0], 1)
+        conn.close()
+
+    def test_sorted_by_before_connect(self):
+        """ an index asked for before the database is opened follows
+            new() """
+        other = DBStorage(os.path.join(self.tmp.name, 'other.db'))
+        index = other.sorted_by(Place, 'max_guest')
+        place = Place(id='p1', max_guest=4)
+        other.new(place)
+        self.assertIs(other.sorted_by(Place, 'max_guest'), index)
+        self.assertEqual(index.top(1, reverse=True), [place])
+        other.close()
+
+    def test_bitmap_before_connect(self):
+        """ a bitmap asked for before the database is opened follows
+            new() """
+        other = DBStorage(os.path.join(self.tmp.name, 'other.db'))
+        index = other.bitmap(Place, 'amenity_ids')
+        place = Place(id='p1', amenity_ids=['wifi'])
+        other.new(place)
+        self.assertIs(other.bitmap(Place, 'amenity_ids'), index)
+        self.assertEqual(index.select(all_of=('wifi',)), [place])
+        other.close()
+
+    def test_foreign_key_indexes(self):
+        """ foreign key columns are indexed """
+        conn = sqlite3.connect(self.path)
+        indexes = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        for name in ('City_state_id', 'Place_city_id', 'Place_user_id',
+                     'Review_place_id', 'Review_user_id'):
+            self.assertIn(name, indexes)
+
+    def test_page(self):
+        """ page reads the rows in the order they were first written,
+            resuming after an id """
+        for id in ('s3', 's1', 's2'):
+            self.db.new(State(id=id))
+        self.db.new(self.db.get(State, 's3'))
+        self.assertEqual([obj.id for obj in self.db.page(State)],
+                         ['s3', 's1', 's2'])
+        self.assertEqual([obj.id for obj in self.db.page(State, 1, 1)],
+                         ['s1'])
+        self.assertEqual([obj.id for obj in self.db.page(State, after='s3')],
+                         ['s1', 's2'])
+        self.assertEqual(len(list(self.db.page(after='s1'))), 1)
+        with self.assertRaises(ValueError):
+            list(self.db.page(State, after='nope'))
+
+    def test_by(self):
+        """ by filters on foreign key columns and attributes """
+        self.db.new(Review(id='r1', place_id='p1', text='nice'))
+        self.db.new(Review(id='r2', place_id='p1'))
+        self.db.new(Review(id='r3', place_id='p2'))
+        self.assertEqual(sorted(self.db.by(Review, place_id='p1')),
+                         ['Review.r1', 'Review.r2'])
+        self.assertEqual(list(self.db.by(Review, place_id='p1',
+                                         text='nice')), ['Review.r1'])
+        self.assertEqual(self.db.by('Nope', place_id='p1'), {})
@@ -1,7 +1,12 @@
 #!/usr/bin/python3
 """ Check Filestorage class """
+import json
+import shutil
+import tempfile
 import unittest
-from os import path
+from unittest.mock import patch
+from os import getenv, path, remove
+import models
 from models import storage
 from models.user import User
 from models.city import City
@@ -22,7 +27,12 @@ class test_storage(unittest.TestCase):
             remove('file.json')
         except Exception:
             pass
-        FileStorage._FileStorage__objects = {}
+        if models.storage_t == 'db':
+            for obj in storage.all().values():
+                storage.delete(obj)
+            storage.save()
+        else:
+            FileStorage._FileStorage__objects = {}
 
     def tearDown(self):
         """ check remove class """
@@ -35,6 +45,7 @@ class test_storage(unittest.TestCase):
         """ check empty class  """
         self.assertEqual(storage.all(), {})
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_all(self):
         """ check  all function """
         storage = FileStorage()
@@ -107,6 +118,7 @@ class test_storage(unittest.TestCase):
         self.assertEqual(obj5, storage.all()[obj5_key])
         self.assertEqual(obj6, storage.all()[obj6_key])
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_reload(self):
         """ check reload classes """
         obj = BaseModel()
@@ -144,3 +156,266 @@ class test_storage(unittest.TestCase):
         self.assertEqual(obj5.id, storage.all()[obj5_key].id)
         self.assertTrue(obj6_key in storage.all().keys())
         self.assertEqual(obj6.id, storage.all()[obj6_key].id)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_mutated(self):
+        """ check a list changed in place is saved """
+        place = Place()
+        place.amenity_ids = ['a']
+        storage.save()
+        place.amenity_ids.append('b')
+        storage.new(place)
+        storage.save()
+        self.assertEqual(place.to_json(), json.dumps(place.to_dict()))
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(storage.get(Place, place.id).amenity_ids,
+                         ['a', 'b'])
+
+    def test_all_cls(self):
+        """ check all with a class returns only its objects """
+        obj = User()
+        obj1 = City()
+        self.assertEqual(storage.all(User), {'User.' + obj.id: obj})
+        self.assertEqual(storage.all('City'), {'City.' + obj1.id: obj1})
+        self.assertEqual(storage.all(State), {})
+
+    def test_count(self):
+        """ check count follows new and delete """
+        obj = User()
+        User()
+        Place()
+        self.assertEqual(storage.count(), 3)
+        self.assertEqual(storage.count(User), 2)
+        self.assertEqual(storage.count('Place'), 1)
+        storage.delete(obj)
+        self.assertEqual(storage.count(User), 1)
+        self.assertNotIn('User.' + obj.id, storage.all(User))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_mutated(self):
+        """ check objects added to or removed from all() directly are
+            counted, found and saved """
+        obj = User(id='direct', first_name='Betty')
+        storage.all()['User.direct'] = obj
+        self.assertEqual(storage.count(User), 1)
+        self.assertEqual(storage.all(User), {'User.direct': obj})
+        self.assertEqual(storage.by(User, first_name='Betty'),
+                         {'User.direct': obj})
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(storage.get(User, 'direct').first_name, 'Betty')
+        del storage.all()['User.direct']
+        self.assertEqual(storage.count(User), 0)
+        self.assertEqual(storage.by(User, first_name='Betty'), {})
+
+    def test_get(self):
+        """ check get finds an object by class and id """
+        obj = User()
+        self.assertIs(storage.get(User, obj.id), obj)
+        self.assertIs(storage.get('User', obj.id), obj)
+        self.assertIsNone(storage.get(City, obj.id))
+
+    def test_by(self):
+        """ check by follows new, updates, deletes and reload """
+        rev = Review(place_id='p1', text='nice')
+        storage.new(rev)
+        storage.new(Review(place_id='p2'))
+        self.assertEqual(storage.by(Review, place_id='p1'),
+                         {'Review.' + rev.id: rev})
+        rev.place_id = 'p2'
+        rev.save()
+        self.assertEqual(storage.by(Review, place_id='p1'), {})
+        self.assertEqual(len(storage.by('Review', place_id='p2')), 2)
+        self.assertEqual(list(storage.by(Review, place_id='p2',
+                                         text='nice')), ['Review.' + rev.id])
+        storage.delete(rev)
+        storage.save()
+        self.assertEqual(len(storage.by(Review, place_id='p2')), 1)
+        storage.reload()
+        self.assertEqual(len(storage.by(Review, place_id='p2')), 1)
+
+    def test_by_unhashable(self):
+        """ check an indexed key set to a list is left out of the index """
+        rev = Review(place_id='p1')
+        storage.new(rev)
+        self.assertEqual(len(storage.by(Review, place_id='p1')), 1)
+        rev.place_id = ['p1']
+        rev.save()
+        self.assertEqual(storage.by(Review, place_id='p1'), {})
+        self.assertEqual(storage.by(Review, place_id=['p1']),
+                         {'Review.' + rev.id: rev})
+        rev.place_id = 'p3'
+        rev.save()
+        self.assertEqual(len(storage.by(Review, place_id='p3')), 1)
+
+    def test_bulk_insert(self):
+        """ check bulk_insert adds every object and saves once """
+        states = (State(id='bulk-{}'.format(i), name='s') for i in range(5))
+        with patch.object(storage, 'save', wraps=storage.save) as save:
+            self.assertEqual(storage.bulk_insert(states, chunk=2), 5)
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(storage.get(State, 'bulk-4').name, 's')
+        storage.reload()
+        self.assertIsNotNone(storage.get(State, 'bulk-0'))
+        for i in range(5):
+            storage.delete(storage.get(State, 'bulk-{}'.format(i)))
+        storage.save()
+
+    def test_page(self):
+        """ check page slices the objects and resumes after an id """
+        states = [State() for i in range(5)]
+        ids = [obj.id for obj in storage.page(State)]
+        self.assertEqual(len(ids), storage.count(State))
+        self.assertEqual([obj.id for obj in storage.page(State, 2, 1)],
+                         ids[1:3])
+        self.assertEqual([obj.id for obj in storage.page(
+            State, 2, after=ids[2])], ids[3:5])
+        self.assertEqual(list(storage.page(State, after=ids[-1])), [])
+        with self.assertRaises(ValueError):
+            list(storage.page(State, after='nope'))
+        storage.delete(states[0])
+        added = State()
+        self.assertEqual([obj.id for obj in storage.page(
+            State, after=ids[3])], [ids[4], added.id])
+        self.assertEqual([obj.id for obj in storage.page(
+            after=ids[3], limit=1)], [ids[4]])
+        for obj in states[1:] + [added]:
+            storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_reload(self):
+        """ check lazy reload builds objects on first access """
+        obj = User()
+        obj1 = City()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        lazy = FileStorage(lazy=True)
+        lazy.reload()
+        self.assertEqual(lazy.count(), 2)
+        self.assertEqual(lazy.count(User), 1)
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        user = lazy.get(User, obj.id)
+        self.assertEqual(user.id, obj.id)
+        self.assertNotIn('City.' + obj1.id,
+                         FileStorage._FileStorage__objects)
+        lazy.save()
+        FileStorage._FileStorage__objects = {}
+        lazy.reload()
+        self.assertEqual(lazy.all(City)['City.' + obj1.id].id, obj1.id)
+        self.assertIn('User.' + obj.id, lazy.all())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_deferred_reload(self):
+        """ check the file is only read on the first access """
+        obj = User()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__sync()
+        FileStorage._FileStorage__deferred = True
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual(storage.get(User, obj.id).id, obj.id)
+        self.assertFalse(FileStorage._FileStorage__deferred)
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(storage.count(), 0)
+
+    @unittest.skipIf(models.storage_t == 'db' or
+                     getenv('HBNB_STORAGE_LAYOUT', 'json') != 'json',
+                     "not testing the json file storage")
+    def test_lazy_export(self):
+        """ check export writes records without building their objects """
+        obj = City()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        lazy = FileStorage(lazy=True)
+        lazy.reload()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        out = path.join(tmp.name, 'cities.jsonl')
+        self.assertEqual(lazy.export(City, 'jsonl', out), lazy.count(City))
+        self.assertNotIn('City.' + obj.id, FileStorage._FileStorage__objects)
+        with open(out) as fname:
+            self.assertIn(obj.id, fname.read())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_batch(self):
+        """ check saves inside batch are written once at the end """
+        with storage.batch():
+            obj = User()
+            obj.save()
+            obj.save()
+            self.assertFalse(path.isfile('file.json'))
+        self.assertTrue(path.isfile('file.json'))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_window(self):
+        """ check saves within the window wait for flush """
+        deferred = FileStorage(save_window=3600)
+        User()
+        deferred.save()
+        self.assertFalse(path.isfile('file.json'))
+        deferred.flush()
+        self.assertTrue(path.isfile('file.json'))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal_setattr(self):
+        """ check the journal writes an attribute set without new() """
+        storage.save()
+        journal = FileStorage(journal=True)
+        try:
+            obj = User()
+            obj.first_name = 'a'
+            journal.save()
+            obj.first_name = 'b'
+            journal.save()
+            del obj.first_name
+            obj.last_name = 'c'
+            journal.save()
+            FileStorage._FileStorage__objects = {}
+            journal.reload()
+            copy = journal.get(User, obj.id)
+            self.assertEqual(copy.last_name, 'c')
+            self.assertNotIn('first_name', copy.__dict__)
+        finally:
+            journal.compact()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_sharded(self):
+        """ check the sharded layout only rewrites changed classes """
+        for lazy in (False, True):
+            sharded = FileStorage(layout='sharded', lazy=lazy)
+            try:
+                FileStorage._FileStorage__objects = {}
+                obj = User()
+                obj1 = Place()
+                sharded.save()
+                self.assertTrue(path.isfile('storage/User.json'))
+                self.assertTrue(path.isfile('storage/Place.json'))
+                remove('storage/User.json')
+                obj1.name = 'Loft'
+                sharded.save()
+                self.assertFalse(path.isfile('storage/User.json'))
+                FileStorage._FileStorage__objects = {}
+                sharded.reload()
+                self.assertEqual(sharded.get(Place, obj1.id).name, 'Loft')
+                self.assertIsNone(sharded.get(User, obj.id))
+            finally:
+                shutil.rmtree('storage', ignore_errors=True)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_binary(self):
+        """ check the binary layout round trips through lazy reload """
+        binary = FileStorage(layout='binary', lazy=True)
+        try:
+            obj = User()
+            obj.first_name = 'Betty'
+            Place()
+            binary.save()
+            FileStorage._FileStorage__objects = {}
+            binary.reload()
+            self.assertEqual(binary.count(), 2)
+            self.assertEqual(FileStorage._FileStorage__objects, {})
+            self.assertEqual(binary.get(User, obj.id).first_name, 'Betty')
+        finally:
+            remove('file.bin')
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+""" Check Frame class """
+import unittest
+from models import storage
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.engine import frame
+from models.engine.frame import Frame, references, stats
+
+
+@unittest.skipIf(frame.numpy is None, 'NumPy is not installed')
+class test_frame(unittest.TestCase):
+    """ check the NumPy columns and their aggregates """
+
+    def setUp(self):
+        """ two cities of a state, four places """
+        self.state = State(name='Lagos')
+        self.ikeja = City(name='Ikeja', state_id=self.state.id)
+        self.lekki = City(name='Lekki', state_id=self.state.id)
+        self.places = [
+            Place(city_id=self.ikeja.id, user_id='u1', price_by_night=100,
+                  max_guest=2),
+            Place(city_id=self.ikeja.id, user_id='u2', price_by_night=50,
+                  max_guest=4),
+            Place(city_id=self.lekki.id, user_id='u1', price_by_night=80,
+                  max_guest=3),
+            Place(city_id='nowhere', user_id='u1', price_by_night='free',
+                  max_guest=1)]
+        self.frame = Frame.build(Place, self.places)
+
+    def test_build(self):
+        """ typed arrays, ids as categories """
+        self.assertEqual(len(self.frame), 4)
+        self.assertEqual(self.frame.columns['max_guest'].dtype.name, 'int64')
+        self.assertEqual(self.frame.columns['price_by_night'].dtype.name,
+                         'float64')
+        self.assertEqual(self.frame.categories['user_id'], ['u1', 'u2'])
+        self.assertEqual(self.frame.decode('user_id'), ['u1', 'u2', 'u1',
+                                                        'u1'])
+        self.assertEqual(references('city_id'), 'City')
+        self.assertEqual(references('place_amenity_id'), 'PlaceAmenity')
+
+    def test_group(self):
+        """ aggregates per category, non-numbers left out """
+        by_city = self.frame.group('city_id', 'mean', 'price_by_night')
+        self.assertEqual(by_city, {self.ikeja.id: 75.0, self.lekki.id: 80.0})
+        self.assertEqual(self.frame.group('user_id'), {'u1': 3, 'u2': 1})
+        self.assertEqual(self.frame.group('user_id', 'sum', 'max_guest'),
+                         {'u1': 6, 'u2': 4})
+        self.assertEqual(self.frame.group('user_id', 'min', 'max_guest'),
+                         {'u1': 1, 'u2': 4})
+        self.assertEqual(self.frame.group('user_id', 'max',
+                                          'price_by_night'),
+                         {'u1': 100.0, 'u2': 50.0})
+        with self.assertRaises(ValueError):
+            self.frame.group('max_guest')
+        with self.assertRaises(ValueError):
+            self.frame.group('user_id', 'median', 'max_guest')
+
+    def test_follow(self):
+        """ categories through a foreign key """
+        cities = Frame.build(City, [self.ikeja, self.lekki])
+        by_state = self.frame.follow('city_id', cities, 'state_id')
+        self.assertEqual(by_state.group('city_id.state_id', 'sum',
+                                        'max_guest'),
+                         {self.state.id: 9, None: 1})
+
+    def test_stats(self):
+        """ aggregates over the objects in storage """
+        storage.new(self.ikeja)
+        for place in self.places[:2]:
+            storage.new(place)
+        review = Review(place_id=self.places[0].id, user_id='u9')
+        storage.new(review)
+        self.assertEqual(
+            stats(storage, City, 'state_id')[self.state.id], 1)
+        self.assertEqual(stats(storage, Place, 'city_id.state_id', 'sum',
+                               'max_guest')[self.state.id], 6)
+        self.assertEqual(stats(storage, Review, 'place_id.user_id')['u1'],
+                         1)
+        self.assertEqual(stats(storage, Review,
+                               'place_id.city_id.state_id')[self.state.id],
+                         1)
+        for obj in [self.ikeja, review] + self.places[:2]:
+            storage.delete(obj)
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+""" Check GridIndex class """
+import unittest
+from models import storage
+from models.place import Place
+from models.engine.geo import GridIndex, distance
+
+
+class test_geo(unittest.TestCase):
+    """ check the spatial index """
+
+    def setUp(self):
+        """ places around Lagos, Accra and Fiji """
+        self.lagos = Place(latitude=6.52, longitude=3.38)
+        self.ikeja = Place(latitude=6.60, longitude=3.35)
+        self.accra = Place(latitude=5.60, longitude=-0.19)
+        self.fiji = Place(latitude=-17.7, longitude=179.9)
+        self.taveuni = Place(latitude=-16.9, longitude=-179.9)
+        self.index = GridIndex()
+        for name in ('lagos', 'ikeja', 'accra', 'fiji', 'taveuni'):
+            self.index.add(name, getattr(self, name))
+
+    def test_distance(self):
+        """ great-circle distances in km """
+        self.assertAlmostEqual(distance(6.52, 3.38, 5.60, -0.19), 408, -1)
+        self.assertEqual(distance(1, 2, 1, 2), 0)
+
+    def test_radius(self):
+        """ places within km, nearest first """
+        self.assertEqual(self.index.within_radius(6.5, 3.4, 20),
+                         [self.lagos, self.ikeja])
+        self.assertEqual(len(self.index.within_radius(6.5, 3.4, 500)), 3)
+        self.assertEqual(self.index.within_radius(-17, 180, 150),
+                         [self.taveuni, self.fiji])
+
+    def test_bbox(self):
+        """ boxes, across the antimeridian too """
+        self.assertEqual(set(self.index.within_bbox(5, -1, 7, 4)),
+                         {self.lagos, self.ikeja, self.accra})
+        self.assertEqual(set(self.index.within_bbox(-20, 179, -15, -179)),
+                         {self.fiji, self.taveuni})
+
+    def test_nearest(self):
+        """ the k nearest, however far """
+        self.assertEqual(self.index.nearest(6.0, 1.0, 1), [self.accra])
+        self.assertEqual(self.index.nearest(6.0, 1.0, -1), [])
+        self.assertEqual(self.index.nearest(0, 0, 10)[-2:],
+                         [self.fiji, self.taveuni])
+
+    def test_update(self):
+        """ moved and removed places are refiled """
+        self.accra.latitude = 6.53
+        self.accra.longitude = 3.39
+        self.index.add('accra', self.accra)
+        self.assertEqual(len(self.index.within_radius(6.5, 3.4, 20)), 3)
+        self.index.remove('accra')
+        self.index.remove('accra')
+        self.assertEqual(len(self.index), 4)
+
+    def test_storage(self):
+        """ the storage index follows new and delete """
+        index = storage.geo()
+        storage.new(self.lagos)
+        self.assertIn(self.lagos, index.within_radius(6.52, 3.38, 1))
+        self.lagos.latitude = 40.0
+        self.lagos.save()
+        self.assertNotIn(self.lagos, index.within_radius(6.52, 3.38, 1))
+        storage.delete(self.lagos)
+        storage.save()
+        self.assertNotIn(self.lagos, storage.geo().nearest(40.0, 3.38, 1))
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+""" Check Journal class """
+import os
+import tempfile
+import unittest
+from models.engine.journal import Journal
+from models.engine.layout import JsonLayout, dump_json, load_json
+
+
+class test_journal(unittest.TestCase):
+    """ check the append-only log """
+
+    def setUp(self):
+        """ journal in a temporary directory """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'file.json')
+        self.journal = Journal(JsonLayout(self.path),
+                               compact_bytes=1 << 30, compact_ratio=1 << 30)
+
+    def tearDown(self):
+        """ remove the directory """
+        self.journal.wait()
+        self.tmp.cleanup()
+
+    def test_replay_on_snapshot(self):
+        """ log records are applied on top of the snapshot """
+        dump_json(self.path, {'User.1': {'id': '1'},
+                              'User.2': {'id': '2'}})
+        self.journal.append([('User.1', {'id': '1', 'name': 'Betty'}),
+                             ('User.2', None),
+                             ('User.3', {'id': '3'})])
+        records = self.journal.load()
+        self.assertEqual(records, {'User.1': {'id': '1', 'name': 'Betty'},
+                                   'User.3': {'id': '3'}})
+
+    def test_torn_last_line(self):
+        """ a half written record at the end is ignored """
+        self.journal.append([('User.1', {'id': '1'})])
+        with open(self.journal.log_path, 'a') as fname:
+            fname.write('{"op": "set", "key": "Us')
+        self.assertEqual(self.journal.load(), {'User.1': {'id': '1'}})
+
+    def test_compact(self):
+        """ compaction folds the log into the snapshot """
+        dump_json(self.path, {'User.1': {'id': '1'}})
+        self.journal.append([('User.2', {'id': '2'}), ('User.1', None)])
+        self.journal.compact()
+        self.assertFalse(os.path.isfile(self.journal.log_path))
+        self.assertEqual(load_json(self.path), {'User.2': {'id': '2'}})
+
+    def test_threshold(self):
+        """ crossing the size threshold compacts in the background """
+        self.journal.compact_bytes = 1
+        self.journal.append([('User.1', {'id': '1'})])
+        self.journal.wait()
+        self.assertFalse(os.path.isfile(self.journal.log_path))
+        self.assertEqual(load_json(self.path), {'User.1': {'id': '1'}})
+
+    def test_truncate(self):
+        """ truncate removes the log """
+        self.journal.append([('User.1', {'id': '1'})])
+        self.journal.truncate()
+        self.assertFalse(os.path.isfile(self.journal.log_path))
+        self.assertEqual(self.journal.load(), {})
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+""" Check JsonLayout and ShardedLayout classes """
+import os
+import tempfile
+import unittest
+from models.engine.journal import Journal
+from models.engine.layout import (JsonLayout, ShardedLayout, BinaryLayout,
+                                  load_json, migrate, packed, unpack)
+
+
+class test_sharded_layout(unittest.TestCase):
+    """ check one file per class """
+
+    def setUp(self):
+        """ layout in a temporary directory """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.layout = ShardedLayout(os.path.join(self.tmp.name, 'storage'))
+        self.records = {'User.1': {'id': '1'}, 'User.2': {'id': '2'},
+                        'Place.3': {'id': '3'}}
+
+    def tearDown(self):
+        """ remove the directory """
+        self.tmp.cleanup()
+
+    def test_dump_load(self):
+        """ records are split by class and read back """
+        self.layout.dump(self.records)
+        self.assertEqual(sorted(self.layout.names()), ['Place', 'User'])
+        self.assertEqual(load_json(self.layout.shard('Place')),
+                         {'Place.3': {'id': '3'}})
+        self.assertEqual(self.layout.load(), self.records)
+        self.assertEqual(self.layout.load(['User']),
+                         {'User.1': {'id': '1'}, 'User.2': {'id': '2'}})
+
+    def test_dump_names(self):
+        """ only the shards of names are rewritten """
+        self.layout.dump(self.records)
+        self.layout.dump({'Place.4': {'id': '4'}, 'User.5': {'id': '5'}},
+                         ['Place'])
+        self.assertEqual(self.layout.load(['Place']),
+                         {'Place.4': {'id': '4'}})
+        self.assertIn('User.1', self.layout.load(['User']))
+        self.layout.dump({}, ['Place'])
+        self.assertEqual(self.layout.names(), ['User'])
+
+    def test_compact(self):
+        """ compaction only rewrites the shards in the log """
+        self.layout.dump(self.records)
+        journal = Journal(self.layout, 1 << 30, 1 << 30)
+        journal.append([('User.1', None)])
+        journal.compact()
+        self.assertFalse(journal.exists())
+        self.assertEqual(self.layout.load(['User']), {'User.2': {'id': '2'}})
+        self.assertEqual(self.layout.load(['Place']),
+                         {'Place.3': {'id': '3'}})
+
+    def test_migrate(self):
+        """ a single JSON file and its log move into shards """
+        path = os.path.join(self.tmp.name, 'file.json')
+        old = Journal(JsonLayout(path))
+        old.layout.dump({'User.1': {'id': '1'}, 'Place.3': {'id': '3'}})
+        old.append([('User.2', {'id': '2'})])
+        migrate(old, self.layout)
+        self.assertEqual(self.layout.load(), self.records)
+        self.assertFalse(os.path.isfile(path))
+        self.assertFalse(old.exists())
+        self.assertTrue(os.path.isfile(path + '.bak'))
+
+
+class test_binary_layout(unittest.TestCase):
+    """ check the mapped binary snapshot """
+
+    def setUp(self):
+        """ layout in a temporary directory """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.layout = BinaryLayout(os.path.join(self.tmp.name, 'file.bin'))
+        self.records = {'User.1': {'id': '1', 'name': 'Betty'},
+                        'Place.é': {'id': 'é'}}
+
+    def tearDown(self):
+        """ remove the directory """
+        self.tmp.cleanup()
+
+    def test_dump_load(self):
+        """ records are packed until decoded, in key order """
+        self.assertEqual(self.layout.load(), {})
+        self.layout.dump(self.records)
+        loaded = self.layout.load()
+        self.assertEqual(list(loaded), sorted(self.records))
+        self.assertTrue(packed(loaded['User.1']))
+        self.assertEqual({key: unpack(val) for key, val in loaded.items()},
+                         self.records)
+
+    def test_rewrite_packed(self):
+        """ packed records are copied as they are """
+        self.layout.dump(self.records)
+        loaded = self.layout.load()
+        loaded['User.2'] = '{"id": "2"}'
+        del loaded['Place.é']
+        self.layout.dump(loaded)
+        self.assertEqual({key: unpack(val) for key, val
+                          in self.layout.load().items()},
+                         {'User.1': {'id': '1', 'name': 'Betty'},
+                          'User.2': {'id': '2'}})
+        self.assertEqual(unpack(loaded['User.1'])['name'], 'Betty')
+
+    def test_not_a_snapshot(self):
+        """ a file without the magic is refused """
+        with open(self.layout.path, 'wb') as fname:
+            fname.write(b'{"User.1": {}}')
+        with self.assertRaises(ValueError):
+            self.layout.load()
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+""" Check Query class """
+import unittest
+from models import storage
+from models.place import Place
+from models.review import Review
+
+
+class test_query(unittest.TestCase):
+    """ check storage.query() """
+
+    def setUp(self):
+        """ a few places of two cities """
+        self.places = [Place(city_id='c{}'.format(i % 2), max_guest=i,
+                             price_by_night=100 + 10 * i)
+                       for i in range(8)]
+        for place in self.places:
+            storage.new(place)
+
+    def tearDown(self):
+        """ remove the places """
+        for place in self.places:
+            storage.delete(place)
+        Place.use_columns(False)
+
+    def test_where(self):
+        """ conditions are combined """
+        query = storage.query(Place).where(city_id='c0', max_guest__gte=4)
+        self.assertEqual(query.plan(), ('index', 'city_id'))
+        self.assertEqual(list(query.where(price_by_night__lt=150)),
+                         [self.places[4]])
+        self.assertEqual(set(query), {self.places[4], self.places[6]})
+
+    def test_lazy(self):
+        """ results are generated on demand and limited """
+        query = storage.query('Place').where(max_guest__ne=1,
+                                             city_id__gte='c')
+        self.assertEqual(query.plan(), ('scan', None))
+        self.assertEqual(len(list(query.limit(3))), 3)
+        objs = iter(query)
+        self.assertIn(next(objs), self.places)
+        with self.assertRaises(ValueError):
+            query.where(max_guest__near=1)
+        with self.assertRaises(ValueError):
+            query.limit(-1)
+
+    def test_range(self):
+        """ range conditions and orders walk the sorted index """
+        query = storage.query(Place).where(price_by_night__gte=120,
+                                           price_by_night__lt=150)
+        self.assertEqual(query.plan(), ('range', 'price_by_night'))
+        self.assertEqual(list(query), self.places[2:5])
+        cheapest = query.where(city_id__gte='c').order_by('-price_by_night')
+        self.assertEqual(list(cheapest.limit(2)), [self.places[4],
+                                                   self.places[3]])
+        top = storage.query(Place).where(city_id__gte='c')
+        self.assertEqual(top.order_by('max_guest').plan(),
+                         ('range', 'max_guest'))
+        self.assertEqual(list(top.order_by('-max_guest').limit(1)),
+                         [self.places[7]])
+        with self.assertRaises(ValueError):
+            top.order_by('-')
+
+    def test_non_numeric_bound(self):
+        """ a bound that is not a number goes through the scan """
+        query = storage.query(Place).where(price_by_night__gte='abc')
+        self.assertEqual(query.plan(), ('scan', None))
+        self.assertEqual(list(query), [])
+        query = query.where(max_guest__lt=2)
+        self.assertEqual(query.plan(), ('range', 'max_guest'))
+        self.assertEqual(list(query), [])
+
+    def test_top_in_city(self):
+        """ the cheapest places of a city, sorted from its index """
+        query = storage.query(Place).where(city_id='c1').order_by(
+            '-price_by_night').limit(2)
+        self.assertEqual(query.plan(), ('index', 'city_id'))
+        self.assertEqual(list(query), [self.places[7], self.places[5]])
+
+    def test_columns(self):
+        """ numeric conditions use the columns when enabled """
+        Place.use_columns()
+        places = [Place(latitude=i + 0.5) for i in range(4)]
+        for place in places:
+            storage.new(place)
+        self.places += places
+        query = storage.query(Place).where(latitude__gt=3, name='')
+        self.assertEqual(query.plan(), ('columns', ['latitude__gt']))
+        self.assertEqual(list(query), [places[3]])
+
+    def test_unknown_attribute(self):
+        """ missing attributes never match """
+        self.assertEqual(list(storage.query(Review).where(stars__gt=2)), [])
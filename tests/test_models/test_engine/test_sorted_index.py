@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+""" Check SortedIndex class """
+import unittest
+from models import storage
+from models.place import Place
+from models.engine.sorted_index import SortedIndex
+
+
+class test_sorted_index(unittest.TestCase):
+    """ check the range index """
+
+    def setUp(self):
+        """ places priced 50, 60, ..., 140, one of them twice """
+        self.places = [Place(price_by_night=50 + 10 * i) for i in range(10)]
+        self.places[9].price_by_night = 60
+        self.index = SortedIndex('price_by_night')
+        self.index.build((str(i), place)
+                         for i, place in enumerate(self.places))
+
+    def test_range(self):
+        """ bounds are inclusive unless open, ties ordered by key """
+        self.assertEqual(list(self.index.range(60, 80)),
+                         [self.places[1], self.places[9], self.places[2],
+                          self.places[3]])
+        self.assertEqual(list(self.index.range(60, 80, low_open=True,
+                                               high_open=True)),
+                         [self.places[2]])
+        self.assertEqual(list(self.index.range(high=55)), [self.places[0]])
+        self.assertEqual(list(self.index.range(200)), [])
+
+    def test_top(self):
+        """ the k cheapest or dearest """
+        self.assertEqual(self.index.top(2), self.places[:2])
+        self.assertEqual(self.index.top(2, reverse=True),
+                         [self.places[8], self.places[7]])
+
+    def test_update(self):
+        """ changed values are moved, non-numbers left out """
+        self.places[0].price_by_night = 1000
+        self.index.add('0', self.places[0])
+        self.assertEqual(self.index.top(1, reverse=True), [self.places[0]])
+        self.places[1].price_by_night = 'cheap'
+        self.index.add('1', self.places[1])
+        self.index.remove('2')
+        self.assertEqual(len(self.index), 8)
+        self.assertEqual(self.index.values, sorted(self.index.values))
+
+    def test_storage(self):
+        """ the storage index follows new and delete """
+        index = storage.sorted_by(Place, 'max_guest')
+        place = Place(max_guest=10 ** 6)
+        storage.new(place)
+        self.assertEqual(index.top(1, reverse=True), [place])
+        storage.delete(place)
+        self.assertNotIn(place, index.top(1, reverse=True))
+        with self.assertRaises(ValueError):
+            storage.sorted_by(Place, 'name')
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+""" Check TextIndex class """
+import os
+import tempfile
+import unittest
+from models import storage
+from models.place import Place
+from models.review import Review
+from models.engine.text_index import TextIndex, tokenize
+
+
+class test_text_index(unittest.TestCase):
+    """ check the full-text index """
+
+    def setUp(self):
+        """ a few places and a review """
+        self.loft = Place(name='Sunny loft',
+                          description='A bright loft near the beach')
+        self.cabin = Place(name='Cabin', description='Quiet cabin, no beach')
+        self.flat = Place(name='Flat', description='A flat in the city')
+        self.review = Review(text='The loft was sunny, sunny, sunny!')
+        self.index = TextIndex()
+        for key in ('loft', 'cabin', 'flat'):
+            self.index.add('Place.' + key, getattr(self, key))
+        self.index.add('Review.1', self.review)
+
+    def test_tokenize(self):
+        """ lowercase words, nothing for non-strings """
+        self.assertEqual(tokenize("Beach-side, 2 rooms!"),
+                         ['beach', 'side', '2', 'rooms'])
+        self.assertEqual(tokenize(None), [])
+
+    def test_search(self):
+        """ rare and repeated words rank first, classes filter """
+        self.assertEqual(self.index.search('sunny'),
+                         ['Review.1', 'Place.loft'])
+        self.assertEqual(self.index.search('loft beach', {'Place'}),
+                         ['Place.loft', 'Place.cabin'])
+        self.assertEqual(self.index.search('beach', limit=1), ['Place.cabin'])
+        self.assertEqual(self.index.search('castle'), [])
+
+    def test_update(self):
+        """ changed objects are refiled, removed ones dropped """
+        self.flat.description = 'A flat by the beach'
+        self.index.add('Place.flat', self.flat)
+        self.assertIn('Place.flat', self.index.search('beach'))
+        self.assertEqual(self.index.search('city'), [])
+        self.index.remove('Place.flat')
+        self.index.remove('Place.flat')
+        self.assertEqual(len(self.index), 3)
+        self.assertNotIn('flat', self.index.postings)
+
+    def test_dump(self):
+        """ read back only with the stamp it was written with """
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'text')
+        self.index.dump(path, [['file.json', 1, 2]])
+        index = TextIndex.load(path, [['file.json', 1, 2]])
+        self.assertEqual(index.postings, self.index.postings)
+        self.assertEqual(index.search('sunny'), self.index.search('sunny'))
+        index.remove('Place.loft')
+        self.assertEqual(index.search('sunny'), ['Review.1'])
+        self.assertEqual(index.docs, {key: terms for key, terms
+                                      in self.index.docs.items()
+                                      if key != 'Place.loft'})
+        self.assertIsNone(TextIndex.load(path, [['file.json', 1, 3]]))
+        self.assertIsNone(TextIndex.load(path + '.missing', []))
+
+    def test_storage(self):
+        """ the storage index follows save and destroy """
+        storage.new(self.loft)
+        storage.save()
+        self.assertIn(self.loft, storage.search('sunny loft', Place))
+        self.loft.name = 'Gloomy attic'
+        self.loft.save()
+        self.assertNotIn(self.loft, storage.search('sunny', Place))
+        self.assertIn(self.loft, storage.search('gloomy'))
+        storage.delete(self.loft)
+        storage.save()
+        self.assertNotIn(self.loft, storage.search('gloomy'))
+
+    def test_persist(self):
+        """ close() writes the index, read back instead of rebuilt """
+        storage.new(self.cabin)
+        storage.save()
+        storage.text()
+        storage.close()
+        storage.reload()
+        index = storage.text()
+        self.assertIsNotNone(index.stamp)
+        self.assertIn('Place.' + self.cabin.id, index.lengths)
+        storage.delete(self.cabin)
+        storage.save()
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+""" Check View class """
+import unittest
+from models import storage
+from models.place import Place
+from models.review import Review
+from models.engine.view import View
+
+
+class test_view(unittest.TestCase):
+    """ check the materialized aggregates """
+
+    def setUp(self):
+        """ places in two cities """
+        self.places = [Place(city_id='a', price_by_night=100),
+                       Place(city_id='a', price_by_night=50),
+                       Place(city_id='b', price_by_night=80),
+                       Place(city_id='b', price_by_night='free')]
+
+    def view(self, agg, attr='price_by_night'):
+        """ a view of agg of attr per city over the places """
+        view = View('Place', 'city_id', agg, attr)
+        for i, place in enumerate(self.places):
+            view.add(str(i), place)
+        return view
+
+    def test_aggregates(self):
+        """ every aggregate, non-numbers left out """
+        self.assertEqual(self.view('count', None).results(),
+                         {'a': 2, 'b': 2})
+        self.assertEqual(self.view('count').results(), {'a': 2, 'b': 1})
+        self.assertEqual(self.view('sum').results(), {'a': 150, 'b': 80})
+        self.assertEqual(self.view('mean').get('a'), 75)
+        self.assertEqual(self.view('min').get('a'), 50)
+        self.assertEqual(self.view('max').get('a'), 100)
+        self.assertEqual(self.view('sum').get('c'), 0)
+        self.assertIsNone(self.view('max').get('c'))
+        self.assertEqual(View('Place').get(), 0)
+        with self.assertRaises(ValueError):
+            View('Place', agg='sum')
+
+    def test_update(self):
+        """ changed objects move, removed ones are taken out """
+        view = self.view('max')
+        self.places[0].city_id = 'b'
+        view.add('0', self.places[0])
+        self.assertEqual(view.results(), {'a': 50, 'b': 100})
+        view.remove('1')
+        view.remove('1')
+        self.assertEqual(view.results(), {'b': 100})
+        self.assertEqual(len(view), 2)
+
+    def test_storage(self):
+        """ declared views follow new, save and delete """
+        place = self.places[0]
+        reviews = storage.materialize('reviews', Review, 'place_id')
+        prices = storage.materialize('prices', 'Place', 'city_id', 'sum',
+                                     'price_by_night')
+        before = prices.get('a')
+        storage.new(place)
+        review = Review(place_id=place.id)
+        storage.new(review)
+        self.assertEqual(reviews.get(place.id), 1)
+        self.assertEqual(prices.get('a'), before + 100)
+        place.price_by_night = 120
+        place.save()
+        self.assertEqual(storage.view('prices').get('a'), before + 120)
+        storage.delete(review)
+        storage.delete(place)
+        storage.save()
+        self.assertEqual(reviews.get(place.id), 0)
+        self.assertEqual(prices.get('a'), before)
+        with self.assertRaises(KeyError):
+            storage.view('missing')
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""Unit tests for the HBNB server and its client"""
+import asyncio
+import os
+import tempfile
+import unittest
+from io import StringIO
+from client import connect, frame, parse, pipe, receive
+from models import storage
+from models.amenity import Amenity
+from models.user import User
+from server import HBNBServer
+
+
+class TestHBNBServer(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the commands served over a socket"""
+
+    async def asyncSetUp(self):
+        """Start a server on a Unix socket"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.address = 'unix:' + os.path.join(self.tmp.name, 'hbnb.sock')
+        self.server = HBNBServer()
+        await self.server.start(self.address)
+
+    async def asyncTearDown(self):
+        """Stop the server"""
+        await self.server.close()
+        self.tmp.cleanup()
+        storage.reload()
+
+    def test_protocol(self):
+        """Test addresses and replies"""
+        self.assertEqual(parse('unix:/tmp/s'), {'path': '/tmp/s'})
+        self.assertEqual(parse('localhost:80'),
+                         {'host': 'localhost', 'port': 80})
+        self.assertEqual(parse('8000'), {'host': '127.0.0.1', 'port': 8000})
+        self.assertEqual(frame('é\n'), b'3\n\xc3\xa9\n')
+
+    async def test_loopback_only(self):
+        """Test TCP addresses other than loopback are refused"""
+        self.assertTrue(HBNBServer.loopback('127.0.0.1'))
+        self.assertTrue(HBNBServer.loopback('::1'))
+        self.assertTrue(HBNBServer.loopback('localhost'))
+        server = HBNBServer()
+        for address in ('0.0.0.0:8000', 'example.com:8000'):
+            with self.assertRaises(ValueError):
+                await server.start(address)
+        self.assertIsNone(server.server)
+        server.executor.shutdown()
+
+    async def test_update_not_evaluated(self):
+        """Test a client cannot run Python through update"""
+        user = User()
+        user.save()
+        await pipe(self.address, [
+            "update User {} name __import__('os').getcwd()".format(
+                user.id)], StringIO())
+        self.assertEqual(storage.get('User', user.id).name,
+                         "__import__('os').getcwd()")
+
+    async def test_pipeline(self):
+        """Test pipelined commands get their replies in order"""
+        count = storage.count('State')
+        out = StringIO()
+        replies = await pipe(self.address, [
+            'create State', 'State.count()', 'show State nope', 'nope',
+            'quit', 'create State'], out)
+        self.assertEqual(replies, 5)
+        lines = out.getvalue().splitlines()
+        self.assertIsNotNone(storage.get('State', lines[0]))
+        self.assertEqual(lines[1:], [str(count + 1),
+                                     '** no instance found **',
+                                     '** invalid command **'])
+        self.assertEqual(storage.count('State'), count + 1)
+
+    async def test_clients(self):
+        """Test clients share the storage, their writes serialized"""
+        count = storage.count(Amenity)
+        outs = [StringIO() for _ in range(3)]
+        await asyncio.gather(*(pipe(self.address, ['create Amenity'] * 20,
+                                    out) for out in outs))
+        ids = set()
+        for out in outs:
+            ids.update(out.getvalue().split())
+        self.assertEqual(len(ids), 60)
+        reader, writer = await connect(self.address)
+        writer.write(b'count Amenity\n')
+        self.assertEqual(await receive(reader), '{}\n'.format(count + 60))
+        writer.close()